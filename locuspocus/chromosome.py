@@ -19,6 +19,10 @@ class Nucleotide(Enum):
     n = 12
 
 
+# Nucleotide names indexed by their enum values
+_NUCLEOTIDE_NAMES = np.array([""] + [x.name for x in Nucleotide])
+
+
 class Chromosome(object):
     """
     A Chromosome is a lightweight object which maps indices to
@@ -44,16 +48,15 @@ class Chromosome(object):
         if isinstance(seq, np.ndarray):
             self.seq = seq
         else:
-            self.seq = np.array([Nucleotide[x].value for x in seq])
+            self.seq = np.array([Nucleotide[x].value for x in seq], dtype=int)
         self._attrs = list(args)
 
     def __getitem__(self, pos):
         if isinstance(pos, slice):
             if pos.start < 1:
                 raise ValueError("Genetic coordinates cannot start less than 1")
-            return "".join(
-                [Nucleotide(x).name for x in self.seq[max(0, pos.start - 1) : pos.stop]]
-            )
+            codes = self.seq[max(0, pos.start - 1) : pos.stop]
+            return "".join(_NUCLEOTIDE_NAMES[codes])
         # chromosomes start at 1, python strings start at 0
         else:
             if pos < 1:
@@ -64,7 +67,7 @@ class Chromosome(object):
         return len(self.seq)
 
     def __repr__(self):
-        return "Chromosome({})".format(reprlib.repr("".join(self[1:100])))
+        return f"Chromosome({reprlib.repr(self[1:100])})"
 
     def __eq__(self, obj):
         if self.name == obj.name and all(self.seq == obj.seq):
@@ -1,5 +1,4 @@
 import logging
-import re
 import reprlib
 import pprint
 
@@ -7,7 +6,6 @@ import numpy as np
 
 from minus80 import Freezable
 from minus80.RawFile import RawFile
-from collections import defaultdict
 from functools import lru_cache
 from .chromosome import Chromosome
 
@@ -1,4 +1,6 @@
 #!/usr/bin/python3
+import io
+import os
 import apsw
 import gzip
 import random
@@ -7,21 +9,146 @@ import logging
 import numpy as np
 import minus80 as m80
 
-from typing import List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 from pathlib import Path
 from minus80 import Freezable
-from functools import wraps, lru_cache
+from functools import wraps
+from collections import OrderedDict
+from contextlib import contextmanager
 
 
-from ..locus import Locus
-from .view import LocusView
+from ..locus import Locus, arrays
+from .view import LocusView, _CORE_COLUMNS
+from .index import IntervalIndex
 from ..exceptions import MissingLocusError, StrandError
 
 __all__ = ["Loci"]
 
 log = logging.getLogger(__name__)
 
+# The columns of the loci table and their numpy dtypes
+_COLUMN_DTYPES = {
+    "LID": np.int64,
+    "chromosome": object,
+    "start": np.int64,
+    "end": np.int64,
+    "source": object,
+    "feature_type": object,
+    "strand": object,
+    "frame": object,
+    "name": object,
+}
+
+# Rows fetched per query when building many LocusViews at once, this
+# stays under the default sqlite limit of 999 bound parameters
+_ROW_BATCH_SIZE = 500
+
+# --------------------------------------------------
+#       Database Tuning
+# --------------------------------------------------
+
+
+def tune_db(db: apsw.Connection) -> None:
+    """
+    Tunes a database connection for a read-heavy access
+    pattern (i.e. many small lookups of locus properties
+    and attrs).
+
+    Parameters
+    ----------
+    db : apsw.Connection
+        The connection to tune
+    """
+    cur = db.cursor()
+    # NOTE: some PRAGMAs return a row, which halts a multi statement
+    #       execute, so each one is executed on its own
+    for pragma in (
+        "PRAGMA cache_size = -131072",
+        "PRAGMA mmap_size = 1073741824",
+        "PRAGMA temp_store = MEMORY",
+    ):
+        cur.execute(pragma).fetchall()
+
+
+@contextmanager
+def bulk_load(db: apsw.Connection):
+    """
+    Runs a bulk load with synchronous writes turned off and
+    restores the previous synchronous setting afterwards.
+
+    minus80 bulk transactions already turn synchronous writes
+    off, but leave them off once the transaction is done, so
+    later writes on the connection would not wait for the disk
+    either. This puts back the durability setting the connection
+    had before the load.
+
+    NOTE: if the process dies during the load, the database
+          may be left corrupt and will need to be rebuilt.
+
+    Parameters
+    ----------
+    db : apsw.Connection
+        The connection being loaded into
+    """
+    cur = db.cursor()
+    (synchronous,) = cur.execute("PRAGMA synchronous").fetchone()
+    cur.execute("PRAGMA synchronous = OFF").fetchall()
+    try:
+        yield
+    finally:
+        cur.execute(f"PRAGMA synchronous = {synchronous}").fetchall()
+
+
+# --------------------------------------------------
+#       File Handling
+# --------------------------------------------------
+
+
+def _open_gzip(filename: str):
+    """
+    Opens a gzipped text file for reading. If rapidgzip is
+    installed, the file is decompressed in parallel, otherwise
+    the (single threaded) gzip module is used.
+    """
+    try:
+        import rapidgzip
+    except ImportError:
+        return gzip.open(filename, "rt")
+    return io.TextIOWrapper(rapidgzip.open(filename, parallelization=os.cpu_count()))
+
+
+# --------------------------------------------------
+#       Caching
+# --------------------------------------------------
+
+
+class _LRUCache(OrderedDict):
+    """
+    A dict that holds at most `maxsize` items, evicting the
+    least recently used item when it is full.
+
+    Unlike functools.lru_cache on a method, the cache belongs to
+    a single instance (so it does not keep the instance alive)
+    and can be cleared when the database changes.
+    """
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        val = super().__getitem__(key)
+        self.move_to_end(key)
+        return val
+
+    def __setitem__(self, key, val):
+        super().__setitem__(key, val)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
 # --------------------------------------------------
 #       Decorators
 # --------------------------------------------------
@@ -73,8 +200,17 @@ class Loci(Freezable):
         # set up the freezable API
         super().__init__(name, rootdir=rootdir)
         self.name = name
+        tune_db(self.m80.db)
         self._initialize_tables()
+        self._cached_loci = _LRUCache(maxsize=2**16)
+        self._cached_LID_lookups = _LRUCache(maxsize=2**16)
+        # Attr dicts shared by every view of a locus, keyed by (table, LID)
+        self._cached_attrs = _LRUCache(maxsize=2**16)
         self._cached_LIDs = None
+        self._cached_interval_index = None
+        self._cached_coordinate_arrays = None
+        # Bumped whenever stored loci are deleted
+        self._generation = 0
 
     @property
     def _LIDs(self) -> List[int]:
@@ -84,6 +220,12 @@ class Loci(Freezable):
             ]
         return self._cached_LIDs
 
+    @property
+    def _interval_index(self) -> IntervalIndex:
+        if self._cached_interval_index is None:
+            self._cached_interval_index = self._build_interval_index()
+        return self._cached_interval_index
+
     def __len__(self) -> int:
         """
         Returns the number of loci in the dataset.
@@ -119,22 +261,28 @@ class Loci(Freezable):
         except MissingLocusError:
             return False
 
-    @lru_cache(maxsize=2**16)
     def __getitem__(self, item):
         """
         A convenience method to extract a locus from
         the loci.
         """
         LID = self._get_LID(item)
-        return self._get_locus_by_LID(LID)
+        try:
+            return self._cached_loci[LID]
+        except KeyError:
+            locus = self._cached_loci[LID] = LocusView(LID, self)
+            return locus
 
     def __iter__(self):
-        LIDs = self.m80.db.cursor().execute(
-            """
-            SELECT LID from loci
-        """
+        # The core columns are read in the same scan as the LIDs so
+        # each LocusView does not need to query for its own row
+        rows = self.m80.db.cursor().execute(
+            f"SELECT LID,{','.join(_CORE_COLUMNS)} FROM loci"
         )
-        return (self._get_locus_by_LID(l) for (l,) in LIDs)
+        for LID, *row in rows:
+            locus = LocusView(LID, self)
+            locus._cached_row = tuple(row)
+            yield locus
 
     # -----------------------------------------
     #       Methods
@@ -175,32 +323,43 @@ class Loci(Freezable):
             core,
         )
         # get the locus LID
-        (LID,) = cur.execute("SELECT last_insert_rowid()").fetchone()
+        LID = cur.getconnection().last_insert_rowid()
 
         if LID is None:  # pragma: no cover
             # I dont know when this would happen without another exception being thrown
             raise ValueError(f"{locus} was not assigned a valid LID!")
         # Add the attrs
-        for key, val in attrs.items():
-            cur.execute(
-                """
-                INSERT INTO loci_attrs 
-                    (LID,key,val) 
-                    VALUES (?,?,?)
-                """,
-                (LID, key, val),
-            )
-        # Add subloci information
-        self._add_subloci(root_LID=LID, parent_LID=None, subloci=locus.subloci, cur=cur)
-        # Add the position to the R*Tree
-        cur.execute(
+        cur.executemany(
             """
-            INSERT INTO positions (LID,start,end,chromosome) VALUES (?,?,?,?)
+            INSERT INTO loci_attrs 
+                (LID,key,val) 
+                VALUES (?,?,?)
             """,
-            (LID, locus.start, locus.end, locus.chromosome),
+            ((LID, key, val) for key, val in attrs.items()),
         )
+        # Add subloci information
+        self._add_subloci(root_LID=LID, parent_LID=None, subloci=locus.subloci, cur=cur)
+        # The in-memory structures no longer reflect the database
+        self._clear_caches()
         return LID
 
+    def add_loci(self, loci: Iterable[Locus]) -> List[int]:
+        """
+        Add many loci to the database in a single transaction.
+
+        Parameters
+        ----------
+        loci : an iterable of Locus objects
+            These loci will be added to the db
+
+        Returns
+        -------
+        A list of the locus IDs (LIDs) of the freshly added loci
+        """
+        with bulk_load(self.m80.db), self.m80.db.bulk_transaction() as cur:
+            LIDs = [self.add_locus(l, cur=cur) for l in loci]
+        return LIDs
+
     def import_gff(
         self,
         filename: str,
@@ -237,36 +396,38 @@ class Loci(Freezable):
         """
         log.info(f"Importing Loci from {filename}")
         if filename.endswith(".gz"):
-            IN = gzip.open(filename, "rt")
+            IN = _open_gzip(filename)
         else:
             IN = open(filename, "r")
+        skip_feature_types = set(skip_feature_types or [])
         loci = []
         idmap = {}
-        total_loci = 0
-        for i, line in enumerate(IN):
-            total_loci += 1
-            # skip comment lines
-            if line.startswith("#"):
-                continue
-            locus = Locus.from_gff_line(
-                line, ID_attr=ID_attr, parent_attr=parent_attr, attr_split=attr_split
-            )
-            # add the locus to the idmap so we can easily add subloci to it later
-            if locus.name is not None:
-                idmap[locus.name] = locus
-            # Check to see if we are in a top level locus
-            if skip_feature_types and locus.feature_type in skip_feature_types:
-                continue
-            if parent_attr not in locus.attrs:
-                loci.append(locus)
-            else:
-                # add the sublocus to the current locus
-                idmap[locus[parent_attr]].add_sublocus(locus, find_parent=True)
+        # Subloci can be listed after their parents are, so the whole
+        # file is parsed before anything is added to the database
+        with IN:
+            for line in IN:
+                # skip comment lines
+                if line.startswith("#"):
+                    continue
+                locus = Locus.from_gff_line(
+                    line,
+                    ID_attr=ID_attr,
+                    parent_attr=parent_attr,
+                    attr_split=attr_split,
+                )
+                # add the locus to the idmap so we can easily add subloci to it later
+                if locus.name is not None:
+                    idmap[locus.name] = locus
+                # Check to see if we are in a top level locus
+                if locus.feature_type in skip_feature_types:
+                    continue
+                if parent_attr not in locus.attrs:
+                    loci.append(locus)
+                else:
+                    # add the sublocus to the current locus
+                    idmap[locus[parent_attr]].add_sublocus(locus, find_parent=True)
         log.info((f"Found {len(loci)} loci, adding to database"))
-        IN.close()
-        with self.m80.db.bulk_transaction() as cur:
-            for l in loci:
-                self.add_locus(l, cur=cur)
+        self.add_loci(loci)
         log.info("Done!")
         return None
 
@@ -292,14 +453,15 @@ class Loci(Freezable):
         A list of n Locus objects
 
         """
-        loci = set()
-        if n > len(self._LIDs):
-            raise ValueError("More than the maximum loci in the database was requested")
         if distinct == True:
+            if n > len(self._LIDs):
+                raise ValueError(
+                    "More than the maximum loci in the database was requested"
+                )
             LIDs = random.sample(self._LIDs, n)
         else:
-            LIDs = random.choices(self._LIDs, n)
-        loci = [self._get_locus_by_LID(x) for x in LIDs]
+            LIDs = random.choices(self._LIDs, k=n)
+        loci = list(self._get_loci_by_LIDs(LIDs))
         if autopop and len(loci) == 1:
             loci = loci[0]
         return loci
@@ -363,39 +525,31 @@ class Loci(Freezable):
         """
         if ignore_strand and same_strand:
             raise ValueError("`ignore_strand` and `same_strand` cannot both be True")
-        # set up variables to use based on 'partial' flag
-        cur = self.m80.db.cursor()
-        # Calculate the correct strand orientation
-        if locus.strand == "+" or ignore_strand == True:
-            if partial == False:
-                anchor = f"l.start > {locus.start} AND l.end < {locus.end}"
-                order = "l.start ASC"
-                index = "locus_start"
-            else:
-                anchor = f"l.end > {locus.start} AND l.start < {locus.end}"
-                order = "l.end ASC"
-                index = "locus_end"
-        elif locus.strand == "-":
-            if partial == False:
-                anchor = f"l.end < {locus.end} AND l.start > {locus.start}"
-                order = "l.end DESC"
-                index = "locus_end"
-            else:
-                anchor = f"l.start < {locus.end} AND l.end  > {locus.start}"
-                order = "l.start DESC"
-                index = "locus_start"
-        else:
+        if not (locus.strand in ("+", "-") or ignore_strand == True):
             raise StrandError
-        query = f"""
-            SELECT l.LID FROM loci l 
-            INDEXED BY {index} 
-            WHERE l.chromosome = '{locus.chromosome}' 
-            AND {anchor} 
-            ORDER BY {order}; 
-        """
-        LIDS = cur.execute(query)
-        for (x,) in LIDS:
-            l = self._get_locus_by_LID(x)
+        # The loci must lie strictly within the input boundaries, the
+        # index is inclusive so shrink the bounds in by one
+        if partial == False:
+            LIDs = self._interval_index.contained(
+                locus.chromosome, locus.start + 1, locus.end - 1
+            )
+        else:
+            LIDs = self._interval_index.overlapping(
+                locus.chromosome, locus.start + 1, locus.end - 1
+            )
+        # The index returns loci by their start position. (+) stranded
+        # queries return partial loci by their end position and (-)
+        # stranded queries are the mirror image of that. Ties are
+        # ordered by LID.
+        plus_strand = locus.strand == "+" or ignore_strand == True
+        by_end = partial if plus_strand else not partial
+        if by_end:
+            coor = self.coordinate_arrays()
+            ends = coor["end"][np.searchsorted(coor["LID"], LIDs)]
+            LIDs = LIDs[np.lexsort((LIDs, ends))]
+        if not plus_strand:
+            LIDs = LIDs[::-1]
+        for l in self._get_loci_by_LIDs(LIDs):
             if same_strand == True and l.strand != locus.strand:
                 continue
             yield l
@@ -600,7 +754,7 @@ class Loci(Freezable):
         if a locus (e.g. a SNP) is inside of another locus, i.e. the
         start of the locus is upstream and the end of the locus
         is downstream of the locus boundaries, this method will
-        return it.
+        return it. Loci are ordered by their start position.
 
         Parameters
         ----------
@@ -610,18 +764,199 @@ class Loci(Freezable):
         -------
         Loci that encompass the input loci
         """
-        cur = self.m80.db.cursor()
-        LIDS = cur.execute(
-            """
-            SELECT LID FROM positions
-            WHERE chromosome = ?
-            AND start < ?
-            AND end > ?
-        """,
-            (locus.chromosome, locus.start, locus.end),
+        # Loci must start before and end after the input locus,
+        # the index is inclusive so shift the bounds out by one
+        LIDs = self._interval_index.encompassing(
+            locus.chromosome, locus.start - 1, locus.end + 1
+        )
+        yield from self._get_loci_by_LIDs(LIDs)
+
+    def to_arrays(self, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Returns the core fields of the loci as column-major numpy
+        arrays, in LID order. This is much cheaper than iterating
+        over every Locus for bulk analyses that only need a couple
+        of fields from each locus.
+
+        Parameters
+        ----------
+        columns : Optional[List[str]]
+            The fields to return, by default all of: LID, chromosome,
+            start, end, source, feature_type, strand, frame and name.
+
+        Returns
+        -------
+        A dictionary mapping each field to a numpy array
+        """
+        if columns is None:
+            columns = list(_COLUMN_DTYPES)
+        for col in columns:
+            if col not in _COLUMN_DTYPES:
+                raise ValueError(f"{col} is not a valid Locus field")
+        rows = (
+            self.m80.db.cursor()
+            .execute(f"SELECT {','.join(columns)} FROM loci ORDER BY LID")
+            .fetchall()
+        )
+        values = zip(*rows) if len(rows) > 0 else [[] for _ in columns]
+        return {
+            col: np.array(vals, dtype=_COLUMN_DTYPES[col])
+            for col, vals in zip(columns, values)
+        }
+
+    def coordinate_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the LIDs, chromosome codes, starts, ends and strand
+        signs of the loci as numpy arrays, in LID order. The arrays are built
+        once and kept in memory until loci are added, and can be
+        passed straight to the functions in locuspocus.locus.arrays.
+
+        NOTE: the arrays are shared between calls, do not modify them.
+        NOTE: coordinates are stored as int32, unless any of them do
+              not fit, in which case they are stored as int64.
+
+        Returns
+        -------
+        A dict with the keys 'LID', 'chrom_code', 'start', 'end'
+        and 'strand'
+        """
+        if self._cached_coordinate_arrays is None:
+            columns = self.to_arrays(["LID", "chromosome", "start", "end", "strand"])
+            self._cached_coordinate_arrays = {
+                "LID": columns["LID"],
+                **arrays.from_columns(
+                    columns["chromosome"],
+                    columns["start"],
+                    columns["end"],
+                    columns["strand"],
+                    widen=True,
+                ),
+            }
+        return self._cached_coordinate_arrays
+
+    @accepts_loci
+    def overlapping_loci(self, locus):
+        """
+        Returns the Loci that overlap the input locus by at least
+        one base pair, ordered by their start position.
+
+        The overlapping loci are found using an in-memory interval
+        index that is built from the database on the first query,
+        so repeated queries do not need to scan the database.
+
+        __________________Ascii Example___________________________
+        These features get returned (y: yes, n:no)
+
+            nnnnn yyyy yyy   yyyyyyyyyyy nnnn
+        __________________________________________________________
+
+              start           end
+        -------[===============]-------------
+
+        Parameters
+        ----------
+        locus : Locus object
+
+        Returns
+        -------
+        Loci that overlap the input locus
+        """
+        LIDs = self._interval_index.overlapping(
+            locus.chromosome, locus.start, locus.end
+        )
+        yield from self._get_loci_by_LIDs(LIDs)
+
+    @accepts_loci
+    def contained_loci(self, locus):
+        """
+        Returns the Loci that lie entirely within the input locus,
+        including loci that share its start or end position. They
+        are ordered by their start position.
+
+        __________________Ascii Example___________________________
+        These features get returned (y: yes, n:no)
+
+            nnnnn yyyy yyy   nnnnnnnnnnn
+        __________________________________________________________
+
+              start           end
+        -------[===============]-------------
+
+        Parameters
+        ----------
+        locus : Locus object
+
+        Returns
+        -------
+        Loci that are contained by the input locus
+        """
+        LIDs = self._interval_index.contained(locus.chromosome, locus.start, locus.end)
+        yield from self._get_loci_by_LIDs(LIDs)
+
+    def overlap_join(self, loci: Iterable[Locus]) -> List[List[LocusView]]:
+        """
+        Returns the Loci that overlap each of the input loci.
+        This gives the same results as calling `overlapping_loci`
+        on each input locus, but the index lookups for all of the
+        input loci are done together.
+
+        Parameters
+        ----------
+        loci : iterable of Locus objects
+
+        Returns
+        -------
+        A list containing a list of overlapping Loci for each
+        input locus, in the same order as the input.
+        """
+        loci = list(loci)
+        results = self._interval_index.overlapping_many(
+            [x.chromosome for x in loci],
+            [x.start for x in loci],
+            [x.end for x in loci],
+        )
+        # Fetch the rows for all of the results together
+        views = iter(list(self._get_loci_by_LIDs(x for LIDs in results for x in LIDs)))
+        return [[next(views) for _ in LIDs] for LIDs in results]
+
+    def coverage(self, chromosome: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the number of loci covering each position of a
+        chromosome. Coverage is returned as a step function: the
+        positions where the coverage changes and the coverage from
+        each position up to the next one.
+
+        Parameters
+        ----------
+        chromosome : str
+            The chromosome to calculate coverage on
+
+        Returns
+        -------
+        A tuple of numpy arrays: (positions, coverage)
+        """
+        return self._interval_index.coverage(chromosome)
+
+    def count_overlapping(self, loci: Iterable[Locus]) -> np.ndarray:
+        """
+        Returns the number of Loci that overlap each of the input
+        loci. This is equivalent to counting the results of
+        `overlapping_loci`, but no LocusViews are created.
+
+        Parameters
+        ----------
+        loci : iterable of Locus objects
+
+        Returns
+        -------
+        A numpy array containing a count for each input locus
+        """
+        loci = list(loci)
+        return self._interval_index.count_overlapping(
+            [x.chromosome for x in loci],
+            [x.start for x in loci],
+            [x.end for x in loci],
         )
-        for (x,) in LIDS:
-            yield self._get_locus_by_LID(x)
 
     # -----------------------------------------
     #       Internal Methods
@@ -648,22 +983,31 @@ class Loci(Freezable):
                     VALUES (?,?,?,?,?,?,?,?,?,?,?)""",
                 (root_LID, parent_LID) + core,
             )
-            (LID,) = cur.execute("SELECT last_insert_rowid()").fetchone()
+            LID = cur.getconnection().last_insert_rowid()
             # add the attrs
-            for key, val in l.attrs.items():
-                cur.execute(
-                    """
-                    INSERT INTO subloci_attrs 
-                    (LID,key,val) 
-                    VALUES (?,?,?)
-                    """,
-                    (LID, key, val),
-                )
+            cur.executemany(
+                """
+                INSERT INTO subloci_attrs 
+                (LID,key,val) 
+                VALUES (?,?,?)
+                """,
+                ((LID, key, val) for key, val in attrs.items()),
+            )
             # recurse with updated parentLID
             self._add_subloci(
                 root_LID=root_LID, parent_LID=LID, subloci=l.subloci, cur=cur
             )
 
+    def _build_interval_index(self) -> IntervalIndex:
+        """
+        Builds an in-memory interval index of the loci in
+        the database.
+        """
+        cols = self.to_arrays(["LID", "chromosome", "start", "end"])
+        return IntervalIndex(
+            cols["LID"], cols["chromosome"], cols["start"], cols["end"]
+        )
+
     def _get_locus_by_LID(self, LID: int) -> LocusView:
         """
         Get a locus by its LID
@@ -674,6 +1018,10 @@ class Loci(Freezable):
             A Locus ID. These are assigned to Locus objects when
             they are added to the Loci database.
 
+        NOTE: this checks that the LID exists. Methods which already
+              got the LID from the database can build the LocusView
+              directly and skip the extra query.
+
         Returns
         -------
         The LocusView.
@@ -691,7 +1039,39 @@ class Loci(Freezable):
             raise MissingLocusError(f"Cannot find Locus for LID: {LID}")
         return LocusView(LID, self)
 
-    @lru_cache(maxsize=2**16)
+    def _get_loci_by_LIDs(self, LIDs: Iterable[int]) -> Iterable[LocusView]:
+        """
+        Get the loci for LIDs that are known to exist, in the
+        same order as the LIDs. The rows of the loci are fetched
+        in batches instead of with one query per locus.
+
+        Parameters
+        ----------
+        LIDs : iterable of int
+            Locus IDs that were read from the database
+
+        Returns
+        -------
+        A generator of LocusViews
+        """
+        LIDs = [int(x) for x in LIDs]
+        columns = ",".join(_CORE_COLUMNS)
+        cur = self.m80.db.cursor()
+        for i in range(0, len(LIDs), _ROW_BATCH_SIZE):
+            batch = LIDs[i : i + _ROW_BATCH_SIZE]
+            rows = {
+                LID: tuple(row)
+                for LID, *row in cur.execute(
+                    f"SELECT LID,{columns} FROM loci "
+                    f"WHERE LID IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+            }
+            for LID in batch:
+                locus = LocusView(LID, self)
+                locus._cached_row = rows[LID]
+                yield locus
+
     def _get_LID(
         self, locus: Union[str, Locus], cursor=None
     ) -> int:  # pragma: no cover
@@ -709,36 +1089,51 @@ class Loci(Freezable):
         An integer Locus ID (LID)
 
         """
+        if (
+            isinstance(locus, LocusView)
+            and locus._ref is self
+            and not locus.is_sublocus
+        ):
+            # Views of our own loci already know their LID, unless
+            # the row they point at has since been deleted
+            if locus._generation != self._generation:
+                raise MissingLocusError(f"Cannot find LID for Locus: {locus._LID}")
+            return locus._LID
+        elif isinstance(locus, str):
+            # Handle the easy case where we have a name
+            query = " SELECT LID FROM loci WHERE name = ?"
+            key = locus
+        elif isinstance(locus, Locus):
+            query = " SELECT LID FROM loci WHERE hash = ?"
+            key = locus.stable_digest()
+        else:
+            raise MissingLocusError(f"Cannot find LID for Locus: {locus}")
+        # Names and hashes share the cache, they never collide
+        # because one is a str and the other an int
+        try:
+            return self._cached_LID_lookups[key]
+        except KeyError:
+            pass
         if cursor is None:
             cur = self.m80.db.cursor()
         else:
             cur = cursor
-        if isinstance(locus, str):
-            # Handle the easy case where we have a name
-            result = cur.execute(
-                " SELECT LID FROM loci WHERE name = ?", (locus,)
-            ).fetchone()
-            if result is None:
-                raise MissingLocusError(f"Cannot find LID for Locus: {locus}")
-            else:
-                LID = result[0]
-        elif isinstance(locus, Locus):
-            result = cur.execute(
-                """
-                SELECT LID FROM loci 
-                    WHERE hash = ?
-            """,
-                (hash(locus),),
-            ).fetchone()
-            if result is None:
-                raise MissingLocusError(f"Cannot find LID for Locus: {locus}")
-            else:
-                LID = result[0]
-
-        else:
+        result = cur.execute(query, (key,)).fetchone()
+        if result is None:
             raise MissingLocusError(f"Cannot find LID for Locus: {locus}")
+        (LID,) = result
+        self._cached_LID_lookups[key] = LID
         return LID
 
+    def _clear_caches(self):
+        # Drop the in-memory structures built from the database
+        self._cached_loci.clear()
+        self._cached_LID_lookups.clear()
+        self._cached_attrs.clear()
+        self._cached_LIDs = None
+        self._cached_interval_index = None
+        self._cached_coordinate_arrays = None
+
     def _nuke_tables(self):
         cur = self.m80.db.cursor()
         cur.execute(
@@ -747,9 +1142,12 @@ class Loci(Freezable):
                 DROP TABLE IF EXISTS subloci;
                 DROP TABLE IF EXISTS loci_attrs;
                 DROP TABLE IF EXISTS subloci_attrs;
+                /* Range queries used to be answered by this R*Tree */
                 DROP TABLE IF EXISTS positions;
             """
         )
+        self._generation += 1
+        self._clear_caches()
         self._initialize_tables()
 
     def _initialize_tables(self):
@@ -776,7 +1174,6 @@ class Loci(Freezable):
                 name TEXT,
                 hash INTEGER
             );
-            CREATE INDEX IF NOT EXISTS locus_LID on loci (LID);
             CREATE INDEX IF NOT EXISTS locus_id ON loci (name);
             CREATE INDEX IF NOT EXISTS locus_chromosome ON loci (chromosome);
             CREATE INDEX IF NOT EXISTS locus_start ON loci (start);
@@ -807,7 +1204,6 @@ class Loci(Freezable):
                 name TEXT, 
                 hash INTEGER
             );
-            CREATE INDEX IF NOT EXISTS subloci_LID ON subloci (LID);
             CREATE INDEX IF NOT EXISTS subloci_root_LID ON subloci (root_LID);
             CREATE INDEX IF NOT EXISTS subloci_parent_LID ON subloci (parent_LID);
         """
@@ -821,10 +1217,9 @@ class Loci(Freezable):
                 key TEXT,
                 val TEXT,
                 FOREIGN KEY(LID) REFERENCES loci(LID),
+                /* The unique constraint also indexes lookups by LID */
                 UNIQUE(LID,key)
             );
-            CREATE INDEX IF NOT EXISTS loci_attrs_LID ON loci_attrs (LID);
-            CREATE INDEX IF NOT EXISTS loci_attrs_LID_key ON loci_attrs (LID,key);
             """
         )
 
@@ -836,23 +1231,10 @@ class Loci(Freezable):
                 key TEXT,
                 val TEXT,
                 FOREIGN KEY(LID) REFERENCES subloci(LID),
+                /* The unique constraint also indexes lookups by LID */
                 UNIQUE(LID,key)
             );
-            CREATE INDEX IF NOT EXISTS subloci_attrs_LID ON subloci_attrs (LID);
-            CREATE INDEX IF NOT EXISTS subloci_attrs_LID_key ON subloci_attrs (LID,key);
-            """
-        )
-
-        # Create a R*Tree table so we can efficiently query by ranges
-        cur.execute(
             """
-            CREATE VIRTUAL TABLE IF NOT EXISTS positions USING rtree_i32( 
-                LID, 
-                start INT,
-                end INT,
-                +chromosome TEXT
-            );
-        """
         )
 
     # --------------------------------------------------
@@ -956,10 +1338,7 @@ class Loci(Freezable):
 
         try:
             loci = cls(name, rootdir=rootdir)
-
-            with loci.m80.db.bulk_transaction() as cur:
-                for l in source_loci:
-                    loci.add_locus(l, cur=cur)
+            loci.add_loci(source_loci)
             return loci
         except Exception as e:
             m80.delete("Loci", name)
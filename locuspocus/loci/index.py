@@ -0,0 +1,258 @@
+import numpy as np
+
+from typing import Iterable, List, Tuple
+
+from ..locus.arrays import coordinates
+
+__all__ = ["IntervalIndex"]
+
+
+class IntervalIndex:
+    """
+    An in-memory index of Locus intervals. Intervals are grouped by
+    chromosome and sorted by their start positions so that overlap
+    queries can be answered with a binary search instead of scanning
+    the database.
+
+    Alongside the starts, the index keeps the running maximum of the
+    ends. It never decreases, so it can also be binary searched to
+    find the first interval that could reach a query start.
+
+    NOTE: Locus coordinates are inclusive, so an interval [10,20]
+          overlaps an interval [20,30].
+    """
+
+    def __init__(
+        self,
+        LIDs: Iterable[int],
+        chromosomes: Iterable[str],
+        starts: Iterable[int],
+        ends: Iterable[int],
+    ):
+        LIDs = np.asarray(LIDs, dtype=np.int64)
+        chromosomes = np.asarray(chromosomes, dtype=object)
+        # 32 bit coordinates halve the memory used by the index,
+        # larger coordinates fall back to 64 bits
+        starts = coordinates(starts, widen=True)
+        ends = coordinates(ends, widen=True)
+        self._chroms = {}
+        # Ends sorted independently of starts, used for counting
+        self._sorted_ends = {}
+        # Group by chromosome, then sort by start within each group
+        names, codes = np.unique(chromosomes.astype(str), return_inverse=True)
+        order = np.lexsort((starts, codes))
+        bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+        for i, name in enumerate(names):
+            idx = order[bounds[i] : bounds[i + 1]]
+            chrom_starts = starts[idx]
+            chrom_ends = ends[idx]
+            self._chroms[name] = (
+                chrom_starts,
+                chrom_ends,
+                LIDs[idx],
+                # No interval before this point reaches past its value
+                np.maximum.accumulate(chrom_ends),
+            )
+            self._sorted_ends[name] = np.sort(chrom_ends)
+
+    def __len__(self):
+        return sum(len(LIDs) for _, _, LIDs, _ in self._chroms.values())
+
+    def overlapping(self, chromosome: str, start: int, end: int) -> np.ndarray:
+        """
+        Returns the LIDs of the intervals that overlap the
+        input coordinates, ordered by their start position.
+
+        Parameters
+        ----------
+        chromosome : str
+            The chromosome of the query interval
+        start : int
+            The start position of the query interval
+        end : int
+            The end position of the query interval
+
+        Returns
+        -------
+        A numpy array of LIDs
+        """
+        try:
+            starts, ends, LIDs, max_ends = self._chroms[str(chromosome)]
+        except KeyError:
+            return np.empty(0, dtype=np.int64)
+        # Intervals before lo all end before the query starts
+        lo = np.searchsorted(max_ends, start, side="left")
+        hi = np.searchsorted(starts, end, side="right")
+        candidates = slice(lo, hi)
+        return LIDs[candidates][ends[candidates] >= start]
+
+    def contained(self, chromosome: str, start: int, end: int) -> np.ndarray:
+        """
+        Returns the LIDs of the intervals that lie entirely within
+        the input coordinates (inclusive), ordered by their start
+        position.
+
+        Parameters
+        ----------
+        chromosome : str
+            The chromosome of the query interval
+        start : int
+            The start position of the query interval
+        end : int
+            The end position of the query interval
+
+        Returns
+        -------
+        A numpy array of LIDs
+        """
+        try:
+            starts, ends, LIDs, _ = self._chroms[str(chromosome)]
+        except KeyError:
+            return np.empty(0, dtype=np.int64)
+        # Only intervals starting inside the query can be contained by it
+        lo = np.searchsorted(starts, start, side="left")
+        hi = np.searchsorted(starts, end, side="right")
+        candidates = slice(lo, hi)
+        return LIDs[candidates][ends[candidates] <= end]
+
+    def encompassing(self, chromosome: str, start: int, end: int) -> np.ndarray:
+        """
+        Returns the LIDs of the intervals that contain the input
+        coordinates (inclusive), ordered by their start position.
+
+        Parameters
+        ----------
+        chromosome : str
+            The chromosome of the query interval
+        start : int
+            The start position of the query interval
+        end : int
+            The end position of the query interval
+
+        Returns
+        -------
+        A numpy array of LIDs
+        """
+        try:
+            starts, ends, LIDs, max_ends = self._chroms[str(chromosome)]
+        except KeyError:
+            return np.empty(0, dtype=np.int64)
+        # Only intervals starting before the query and reaching
+        # its end can contain it
+        lo = np.searchsorted(max_ends, end, side="left")
+        hi = np.searchsorted(starts, start, side="right")
+        candidates = slice(lo, hi)
+        return LIDs[candidates][ends[candidates] >= end]
+
+    def coverage(self, chromosome: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the number of intervals covering each position of
+        a chromosome as a step function. Each interval adds one at
+        its start and removes one after its end; the running sum
+        of these events is the coverage.
+
+        Parameters
+        ----------
+        chromosome : str
+            The chromosome to calculate coverage on
+
+        Returns
+        -------
+        A tuple of two numpy arrays: the positions where the
+        coverage changes and the coverage from each of these
+        positions up to the next one
+        """
+        try:
+            starts, ends, _, _ = self._chroms[str(chromosome)]
+        except KeyError:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        positions, inverse = np.unique(
+            np.concatenate([starts, ends.astype(np.int64) + 1]), return_inverse=True
+        )
+        changes = np.zeros(len(positions), dtype=np.int64)
+        np.add.at(changes, inverse[: len(starts)], 1)
+        np.add.at(changes, inverse[len(starts) :], -1)
+        return positions, np.cumsum(changes)
+
+    def overlapping_many(
+        self,
+        chromosomes: Iterable[str],
+        starts: Iterable[int],
+        ends: Iterable[int],
+    ) -> List[np.ndarray]:
+        """
+        Returns the LIDs of the intervals that overlap each of
+        the query intervals. The binary searches for all of the
+        queries on a chromosome are done in a single call.
+
+        Parameters
+        ----------
+        chromosomes : iterable of str
+            The chromosomes of the query intervals
+        starts : iterable of int
+            The start positions of the query intervals
+        ends : iterable of int
+            The end positions of the query intervals
+
+        Returns
+        -------
+        A list of numpy arrays of LIDs, one for each query
+        """
+        chromosomes = np.asarray(chromosomes, dtype=object).astype(str)
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        results = [np.empty(0, dtype=np.int64)] * len(chromosomes)
+        for chrom in np.unique(chromosomes):
+            if chrom not in self._chroms:
+                continue
+            chrom_starts, chrom_ends, LIDs, max_ends = self._chroms[chrom]
+            (queries,) = np.nonzero(chromosomes == chrom)
+            los = np.searchsorted(max_ends, starts[queries], "left")
+            his = np.searchsorted(chrom_starts, ends[queries], "right")
+            for i, lo, hi in zip(queries, los, his):
+                candidates = slice(lo, hi)
+                results[i] = LIDs[candidates][chrom_ends[candidates] >= starts[i]]
+        return results
+
+    def count_overlapping(
+        self,
+        chromosomes: Iterable[str],
+        starts: Iterable[int],
+        ends: Iterable[int],
+    ) -> np.ndarray:
+        """
+        Returns the number of intervals that overlap each of the
+        query intervals, without collecting the overlapping LIDs.
+
+        An interval overlaps a query unless it starts after the
+        query ends or ends before the query starts. The intervals
+        that end before the query starts are a subset of those that
+        start before it ends, so the count is the difference of two
+        binary searches.
+
+        Parameters
+        ----------
+        chromosomes : iterable of str
+            The chromosomes of the query intervals
+        starts : iterable of int
+            The start positions of the query intervals
+        ends : iterable of int
+            The end positions of the query intervals
+
+        Returns
+        -------
+        A numpy array of counts, one for each query
+        """
+        chromosomes = np.asarray(chromosomes, dtype=object).astype(str)
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        counts = np.zeros(len(chromosomes), dtype=np.int64)
+        for chrom in np.unique(chromosomes):
+            if chrom not in self._chroms:
+                continue
+            chrom_starts = self._chroms[chrom][0]
+            (queries,) = np.nonzero(chromosomes == chrom)
+            counts[queries] = np.searchsorted(
+                chrom_starts, ends[queries], "right"
+            ) - np.searchsorted(self._sorted_ends[chrom], starts[queries], "left")
+        return counts
@@ -2,8 +2,58 @@ from ..locus import Locus, LocusAttrs, SubLoci
 
 __all__ = ["LocusView"]
 
+# The core columns of the loci and subloci tables
+_CORE_COLUMNS = (
+    "chromosome",
+    "start",
+    "end",
+    "source",
+    "feature_type",
+    "strand",
+    "frame",
+    "name",
+    "hash",
+)
+_CORE_INDEX = {name: i for i, name in enumerate(_CORE_COLUMNS)}
+
+# Queries are built once so that the SQL text is identical between
+# calls, which lets sqlite reuse its prepared statements
+_ROW_QUERIES = {
+    table: f"SELECT {','.join(_CORE_COLUMNS)} FROM {table} WHERE LID = ?"
+    for table in ("loci", "subloci")
+}
+_ATTRS_QUERIES = {
+    table: {
+        "items": f"SELECT key, val FROM {table} WHERE LID = ?",
+        "setitem": f"INSERT OR REPLACE INTO {table} (LID,key,val) VALUES (?,?,?)",
+    }
+    for table in ("loci_attrs", "subloci_attrs")
+}
+
+
+class _CoreProperty:
+    """
+    A read-only LocusView property that returns one of
+    the core columns from the view's cached row.
+    """
+
+    __slots__ = ("index",)
+
+    def __init__(self, name):
+        self.index = _CORE_INDEX[name]
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance._row[self.index]
+
+    def __set__(self, instance, value):
+        raise AttributeError("LocusView properties are read-only")
+
 
 class AttrsView(LocusAttrs):
+    __slots__ = ("parent",)
+
     def __init__(self, parent):
         self.parent = parent
 
@@ -20,66 +70,57 @@ class AttrsView(LocusAttrs):
         else:
             return "loci_attrs"
 
+    @property
+    def _queries(self):
+        return _ATTRS_QUERIES[self.table]
+
+    @property
+    def _cache_key(self):
+        return (self.table, self.parent._LID)
+
+    @property
+    def _attrs(self):
+        # All of the attrs are read with a single query the first time
+        # any of them are needed. The dict is kept by the Loci, so every
+        # view of the same locus shares it and sees writes made through
+        # any of them.
+        cache = self.parent._ref._cached_attrs
+        try:
+            return cache[self._cache_key]
+        except KeyError:
+            cur = self.parent._ref.m80.db.cursor()
+            attrs = cache[self._cache_key] = dict(
+                cur.execute(self._queries["items"], (self.parent._LID,))
+            )
+            return attrs
+
     def __len__(self):
-        cur = self.parent._ref.m80.db.cursor()
-        cur.execute(
-            f"""
-            SELECT COUNT(*) FROM {self.table}
-            WHERE LID = ?
-            """,
-            (self.parent._LID,),
-        )
-        return cur.fetchone()[0]
+        return len(self._attrs)
 
     def keys(self):
-        cur = self.parent._ref.m80.db.cursor()
-        results = cur.execute(
-            f"""
-            SELECT key FROM {self.table}
-            WHERE LID = ?
-            """,
-            (self.parent._LID,),
-        )
-        return [k[0] for k in results]
+        return list(self._attrs.keys())
 
     def values(self):
-        cur = self.parent._ref.m80.db.cursor()
-        results = cur.execute(
-            f"""
-            SELECT val FROM {self.table} 
-            WHERE LID = ?
-            """,
-            (self.parent._LID,),
-        )
-        return [k[0] for k in results]
+        return list(self._attrs.values())
 
     def items(self):
-        return zip(self.keys(), self.values())
+        return list(self._attrs.items())
+
+    def __contains__(self, key):
+        return key in self._attrs
 
     def __getitem__(self, key):
-        cur = self.parent._ref.m80.db.cursor()
         try:
-            (val,) = cur.execute(
-                f"""
-                SELECT val FROM {self.table}
-                WHERE LID = ? AND key = ?
-            """,
-                (self.parent._LID, key),
-            ).fetchone()
-        except TypeError:
+            return self._attrs[key]
+        except KeyError:
             raise KeyError(f'"{key}" in in attrs')
-        return val
 
     def __setitem__(self, key, val):
         cur = self.parent._ref.m80.db.cursor()
-        cur.execute(
-            f"""
-            INSERT OR REPLACE INTO {self.table}
-            (LID,key,val)
-            VALUES (?,?,?)
-        """,
-            (self.parent._LID, key, val),
-        )
+        cur.execute(self._queries["setitem"], (self.parent._LID, key, val))
+        # Re-read the attrs next time so values come back
+        # exactly as the database stored them
+        self.parent._ref._cached_attrs.pop(self._cache_key, None)
 
     def __repr__(self):
         return "{" + ",".join([":".join([x, y]) for x, y in self.items()]) + "}"
@@ -87,8 +128,11 @@ class AttrsView(LocusAttrs):
 
 class SubLociView(SubLoci):
     # A restricted list interface to subloci
+    __slots__ = ("parent", "_cached_LIDs")
+
     def __init__(self, parent):
         self.parent = parent
+        self._cached_LIDs = None
 
     @property
     def empty(self):
@@ -111,40 +155,62 @@ class SubLociView(SubLoci):
             """
         return query
 
+    @property
+    def _LIDs(self):
+        # Subloci cannot be added to a view, so the LIDs
+        # only need to be fetched once
+        if self._cached_LIDs is None:
+            cur = self.parent._ref.m80.db.cursor()
+            self._cached_LIDs = [
+                LID
+                for (LID,) in cur.execute(
+                    self._LID_query + "ORDER BY LID", (self.parent._LID,)
+                )
+            ]
+        return self._cached_LIDs
+
     def __iter__(self):
-        cur = self.parent._ref.m80.db.cursor()
-        LIDs = (LID for (LID,) in cur.execute(self._LID_query, (self.parent._LID,)))
-        return (LocusView(x, self.parent._ref, sublocus=True) for x in LIDs)
+        return (LocusView(x, self.parent._ref, sublocus=True) for x in self._LIDs)
 
     def add(self, locus):
         raise NotImplementedError
 
     def __getitem__(self, index):
-        query = self._LID_query + "ORDER BY LID LIMIT 1 OFFSET ?"
-        (LID,) = (
-            self.parent._ref.m80.db.cursor()
-            .execute(query, (self.parent._LID, index))
-            .fetchone()
-        )
-        return LocusView(LID, self.parent._ref, sublocus=True)
+        return LocusView(self._LIDs[index], self.parent._ref, sublocus=True)
 
     def __len__(self):
-        return (
-            self.parent._ref.m80.db.cursor()
-            .execute(
-                self._LID_query.replace(
-                    "SELECT LID FROM subloci", "SELECT COUNT(LID) FROM subloci"
-                ),
-                (self.parent._LID,),
-            )
-            .fetchone()[0]
-        )
+        return len(self._LIDs)
 
     def __repr__(self):
         if self.empty:
             return "[]"
         return "[\n" + "\t\n".join([repr(x) for x in self]) + "\n]"
 
+    def traverse(self, mode="depth"):
+        """
+        Perform a depth first traversal of subloci. The entire
+        subtree, including the core columns of each sublocus, is
+        fetched with a single recursive query.
+        """
+        # Each path is the zero padded LIDs from the top of the subtree,
+        # so sorting by path gives the same order as a depth first walk
+        query = f"""
+            WITH RECURSIVE tree(LID, path) AS (
+                SELECT LID, printf('%020d', LID) FROM ({self._LID_query})
+                UNION ALL
+                SELECT s.LID, tree.path || '/' || printf('%020d', s.LID)
+                FROM subloci s JOIN tree ON s.parent_LID = tree.LID
+            )
+            SELECT s.LID, {','.join('s.' + x for x in _CORE_COLUMNS)}
+            FROM tree JOIN subloci s ON s.LID = tree.LID
+            ORDER BY tree.path
+        """
+        cur = self.parent._ref.m80.db.cursor()
+        for LID, *row in cur.execute(query, (self.parent._LID,)):
+            locus = LocusView(LID, self.parent._ref, sublocus=True)
+            locus._cached_row = tuple(row)
+            yield locus
+
 
 class LocusView(Locus):
     """
@@ -152,10 +218,15 @@ class LocusView(Locus):
     Locus objects stored in a Loci database
     """
 
+    __slots__ = ("_LID", "_ref", "_sublocus", "_cached_row", "_generation")
+
     def __init__(self, LID: int, refloci: "Loci", sublocus: bool = False):
         self._LID = LID
         self._ref = refloci
+        # Views made before the tables were nuked point at deleted rows
+        self._generation = refloci._generation
         self._sublocus = sublocus
+        self._cached_row = None
         self.attrs = AttrsView(self)
         self.subloci = SubLociView(self)
 
@@ -173,48 +244,45 @@ class LocusView(Locus):
         else:
             return "loci"
 
-    def _property(self, name):
-        (val,) = (
-            self._ref.m80.db.cursor()
-            .execute(f"SELECT {name} FROM {self.table} WHERE LID = ?", (self._LID,))
-            .fetchone()
-        )
-        return val
-
-    @property
-    def chromosome(self):
-        return self._property("chromosome")
-
-    @property
-    def start(self):
-        return self._property("start")
-
-    @property
-    def end(self):
-        return self._property("end")
-
-    @property
-    def feature_type(self):
-        return self._property("feature_type")
-
-    @property
-    def strand(self):
-        return self._property("strand")
-
-    @property
-    def frame(self):
-        return self._property("frame")
-
     @property
-    def name(self):
-        return self._property("name")
+    def _row(self):
+        # Stored loci are never updated, so all of the core columns
+        # are fetched together the first time any one of them is used
+        if self._cached_row is None:
+            self._cached_row = (
+                self._ref.m80.db.cursor()
+                .execute(_ROW_QUERIES[self.table], (self._LID,))
+                .fetchone()
+            )
+        return self._cached_row
 
-    @property
-    def source(self):
-        return self._property("source")
+    chromosome = _CoreProperty("chromosome")
+    start = _CoreProperty("start")
+    end = _CoreProperty("end")
+    feature_type = _CoreProperty("feature_type")
+    strand = _CoreProperty("strand")
+    frame = _CoreProperty("frame")
+    name = _CoreProperty("name")
+    source = _CoreProperty("source")
 
     def add_sublocus(self, locus):
         raise NotImplementedError
 
-    def __hash__(self):
-        return self._property("hash")
+    def __eq__(self, other):
+        # Views of the same stored locus are equal without
+        # reading their rows or attrs from the database
+        if (
+            isinstance(other, LocusView)
+            and self._ref is other._ref
+            and self._LID == other._LID
+            and self.is_sublocus == other.is_sublocus
+        ):
+            return True
+        return super().__eq__(other)
+
+    # Defining __eq__ would otherwise set __hash__ to None
+    __hash__ = Locus.__hash__
+
+    def stable_digest(self):
+        # The digest was stored when the locus was added
+        return self._row[_CORE_INDEX["hash"]]
@@ -1,13 +1,14 @@
 #!/usr/bin/python3
 
 
+import sys
 import math
 import hashlib
 
 
 import numpy as np
 
-from typing import Any, Optional
+from typing import Any, Optional, Tuple, Union
 
 from ..exceptions import StrandError, ChromosomeError, MissingLocusError
 from .subloci import SubLoci
@@ -16,8 +17,29 @@ from .attrs import LocusAttrs
 
 __all__ = ["Locus"]
 
+# Maps a strand to its direction along the chromosome
+_STRAND_SIGN = {"+": 1, "-": -1}
+
+# Python reduces ints modulo this prime when hashing them, the hash
+# column of existing Loci databases holds md5 digests reduced by it
+_DIGEST_MODULUS = 2**61 - 1
+
 
 class Locus:
+    # Loci are created in large numbers, slots avoid a per-instance dict
+    __slots__ = (
+        "chromosome",
+        "start",
+        "end",
+        "source",
+        "feature_type",
+        "strand",
+        "frame",
+        "name",
+        "attrs",
+        "subloci",
+    )
+
     def __init__(
         self,
         chromosome: str,
@@ -32,11 +54,13 @@ class Locus:
         attrs: LocusAttrs = None,
         subloci: SubLoci = None,
     ):
-        self.chromosome = str(chromosome)
+        # Interned names compare by identity in the common case and
+        # loci from the same source share a single copy of each
+        self.chromosome = sys.intern(str(chromosome))
         self.start = int(start)
         self.end = int(end)
-        self.source = str(source)
-        self.feature_type = str(feature_type)
+        self.source = sys.intern(str(source))
+        self.feature_type = sys.intern(str(feature_type))
         self.strand = str(strand)
         self.frame = frame
         self.name = name
@@ -44,68 +68,94 @@ class Locus:
         self.attrs = LocusAttrs(attrs)
         self.subloci = SubLoci(subloci)
 
-    def __eq__(self, other):
-        return hash(self) == hash(other) and self.attrs == other.attrs
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Locus):
+            return NotImplemented
+        # Subloci are compared by their core properties through the
+        # digest, their attrs are not compared
+        return (
+            self._core() == other._core()
+            and self.stable_digest() == other.stable_digest()
+            and self.attrs == other.attrs
+        )
 
-    def __hash__(self):
+    def __hash__(self) -> int:
         """
-        Convert the locus to a hash, uses md5. The hash
-        is computed using the *core* properties of the
-        Locus, i.e. changing any attrs will not change
-        the hash value.
+        Convert the locus to a hash. The hash is computed
+        using the *core* properties of the Locus, i.e.
+        changing any attrs or subloci will not change the
+        hash value.
+
+        NOTE: this uses the builtin tuple hash, which is not
+              the same between processes. Use stable_digest
+              for a value that can be stored.
 
-        Parameters
-        ----------
-        None
         Returns
         -------
-        int : md5 hash of locus
+        int : hash of locus
         """
-        field_list = [
-            str(x)
-            for x in (
-                self.chromosome,
-                self.start,
-                self.end,
-                self.feature_type,
-                self.strand,
-                self.frame,
-            )
-        ]
-        subloci_list = [str(hash(x)) for x in self.subloci]
+        return hash(self._core())
+
+    def _core(self) -> tuple:
+        # The properties that identify a locus, attrs are excluded
+        return (
+            self.chromosome,
+            self.start,
+            self.end,
+            self.feature_type,
+            self.strand,
+            self.frame,
+        )
+
+    def stable_digest(self) -> int:
+        """
+        Returns an md5 digest of the *core* properties of the
+        Locus, i.e. changing any attrs will not change the
+        digest. Unlike the builtin hash, the digest is the
+        same across processes, so it can be stored in a
+        database.
+
+        NOTE: the digest is stored in the hash column of Loci
+              databases, changing how it is computed breaks
+              lookups in existing databases.
+
+        Returns
+        -------
+        int : md5 digest of the locus
+        """
+        field_list = [str(x) for x in self._core()]
+        subloci_list = [str(x.stable_digest()) for x in self.subloci]
         # Create a full string
-        loc_string = "_".join(field_list + subloci_list)  # attr_list + subloci_list)
-        digest = hashlib.md5(str.encode(loc_string)).hexdigest()
-        return int(digest, base=16)
+        loc_string = "_".join(field_list + subloci_list)
+        digest = hashlib.md5(str.encode(loc_string)).digest()
+        # The digest is reduced to the value the hash column has
+        # always held, which also fits into a sqlite INTEGER
+        return int.from_bytes(digest, "big") % _DIGEST_MODULUS
 
-    def __len__(self):
+    def __len__(self) -> int:
         return abs(self.end - self.start) + 1
 
-    def __lt__(self, locus):
-        if self.chromosome == locus.chromosome:
-            return self.start < locus.start
-        else:
-            return self.chromosome < locus.chromosome
+    def __lt__(self, locus: "Locus") -> bool:
+        return (self.chromosome, self.start) < (locus.chromosome, locus.start)
 
-    def __le__(self, locus):
+    def __le__(self, locus: "Locus") -> bool:
         if (self.chromosome, self.coor) == (locus.chromosome, locus.coor):
             return True
         else:
             return self < locus
 
-    def __ge__(self, locus):
+    def __ge__(self, locus: "Locus") -> bool:
         if (self.chromosome, self.coor) == (locus.chromosome, locus.coor):
             return True
         else:
             return self > locus
 
-    def __gt__(self, locus):
-        if self.chromosome == locus.chromosome:
-            return self.start > locus.start
-        else:
-            return self.chromosome > locus.chromosome
+    def __gt__(self, locus: "Locus") -> bool:
+        return (self.chromosome, self.start) > (locus.chromosome, locus.start)
 
-    def __repr__(self):
+    def __repr__(self) -> str:
         return (
             f"Locus("
             f"{self.chromosome},{self.start},{self.end},source={self.source},"
@@ -119,27 +169,28 @@ class Locus:
         )
 
     @property
-    def stranded_start(self):
-        if self.strand == "+":
-            return min(self.coor)
-        elif self.strand == "-":
-            return max(self.coor)
-        else:
+    def _strand_sign(self) -> int:
+        try:
+            return _STRAND_SIGN[self.strand]
+        except KeyError:
             raise StrandError
 
     @property
-    def stranded_end(self):
-        if self.strand == "+":
-            return max(self.coor)
-        elif self.strand == "-":
-            return min(self.coor)
-        else:
-            raise StrandError
+    def stranded_start(self) -> int:
+        if self._strand_sign > 0:
+            return min(self.start, self.end)
+        return max(self.start, self.end)
+
+    @property
+    def stranded_end(self) -> int:
+        if self._strand_sign > 0:
+            return max(self.start, self.end)
+        return min(self.start, self.end)
 
-    def __getitem__(self, item):
+    def __getitem__(self, item: str) -> Any:
         return self.attrs[item]
 
-    def __setitem__(self, key, val):
+    def __setitem__(self, key: str, val: Any) -> None:
         self.attrs[key] = val
 
     def add_sublocus(
@@ -166,7 +217,7 @@ class Locus:
                     f"Unable to resolve the key:{parent_attr} to find parent Locus"
                 )
 
-    def as_record(self):
+    def as_record(self) -> Tuple[tuple, LocusAttrs]:
         return (
             (
                 self.chromosome,
@@ -177,11 +228,42 @@ class Locus:
                 self.strand,
                 self.frame,
                 self.name,
-                hash(self),
+                self.stable_digest(),
             ),
             self.attrs,
         )
 
+    def as_dict(self, deep: bool = False) -> dict:
+        """
+        Returns the Locus as a dictionary.
+
+        By default the dictionary is shallow: subloci are
+        represented by their names so that db-backed loci
+        do not fetch their entire sublocus tree.
+
+        Parameters
+        ----------
+        deep : bool (default: False)
+            If True, subloci are recursively converted to
+            dictionaries as well.
+        """
+        if deep:
+            subloci = [x.as_dict(deep=True) for x in self.subloci]
+        else:
+            subloci = [x.name for x in self.subloci]
+        return {
+            "chromosome": self.chromosome,
+            "start": self.start,
+            "end": self.end,
+            "source": self.source,
+            "feature_type": self.feature_type,
+            "strand": self.strand,
+            "frame": self.frame,
+            "name": self.name,
+            "attrs": dict(self.attrs.items()),
+            "subloci": subloci,
+        }
+
     def default_getitem(self, key, default=None) -> Any:
         """
         Returns the attr value of the Locus based on the key.
@@ -198,14 +280,12 @@ class Locus:
             this value by default.
         """
         try:
-            val = self.attrs[key]
+            return self.attrs[key]
         except KeyError:
-            val = default
-        finally:
-            return val
+            return default
 
     @property
-    def coor(self):
+    def coor(self) -> Tuple[int, int]:
         """
         Returns a tuple containing the start and end
         positions of the locus
@@ -222,10 +302,9 @@ class Locus:
         distance : int
             The distance upstream of the locus
         """
-        if self.strand == "+":
+        if self._strand_sign > 0:
             return max(0, self.start - distance)
-        elif self.strand == "-":
-            return self.end + distance
+        return self.end + distance
 
     def downstream(self, distance: int) -> int:
         """
@@ -237,14 +316,12 @@ class Locus:
         distance : int
             The distance downstream of the locus
         """
-        if self.strand == "+":
+        if self._strand_sign > 0:
             return self.end + distance
-        elif self.strand == "-":
-            return max(0, self.start) - distance
-        # return self.end + distance
+        return max(0, self.start) - distance
 
     @property
-    def center(self):
+    def center(self) -> float:
         """
         Calculates the center base pair position of
         the locus.
@@ -259,7 +336,7 @@ class Locus:
         """
         return self.start + len(self) / 2
 
-    def distance(self, locus):
+    def distance(self, locus: "Locus") -> Union[int, float]:
         """
         Return the number of base pairs between two loci.
         NOTE: this excludes the start/end bases of the loci.
@@ -287,12 +364,44 @@ class Locus:
         """
         if self.chromosome != locus.chromosome:
             distance = np.inf
+        elif locus.start < self.start:
+            distance = self.start - locus.end - 1
         else:
-            x, y = sorted([self, locus])
-            distance = y.start - x.end - 1
+            distance = locus.start - self.end - 1
         return distance
 
-    def center_distance(self, locus):
+    def overlaps(self, locus: "Locus") -> bool:
+        """
+        Returns True if the two loci overlap by at least
+        one base pair.
+
+        ___________Ascii Example__________________________
+
+              Locus A          Locus B
+        ------=========------=============---------------
+        A.overlaps(B) == False
+
+              Locus A
+        ------=========----------------------------------
+                    =============
+                       Locus B
+        A.overlaps(B) == True
+
+        NOTE: use locuspocus.locus.arrays.overlaps to test
+              many pairs of loci at once.
+
+        Parameters
+        ----------
+        locus : Locus Object
+            A second locus object to test against.
+        """
+        return (
+            self.chromosome == locus.chromosome
+            and self.start <= locus.end
+            and locus.start <= self.end
+        )
+
+    def center_distance(self, locus: "Locus") -> Union[int, float]:
         """
         Return the distance between the center of two loci.
         If the loci are on different chromosomes, return np.inf.
@@ -314,7 +423,7 @@ class Locus:
             distance = math.floor(abs(self.center - locus.center))
         return distance
 
-    def combine(self, locus):
+    def combine(self, locus: "Locus") -> "Locus":
         """
         Returns a new Locus with start and stop boundaries
         that contain both of the input loci. Both input loci are
@@ -334,7 +443,8 @@ class Locus:
         """
         if self.chromosome != locus.chromosome:
             raise ChromosomeError("Input Chromosomes do not match")
-        x, y = sorted([self, locus])
+        # Same order as sorted([self, locus]) without building a list
+        x, y = (locus, self) if locus < self else (self, locus)
         start = x.start
         end = y.end
         return Locus(self.chromosome, start, end, subloci=[self, locus])
@@ -350,7 +460,7 @@ class Locus:
                 print("%s%s" % (pre, node.name))
         return root
 
-    def __str__(self):
+    def __str__(self) -> str:
         return repr(self)
 
     # --------------------------------
@@ -380,12 +490,10 @@ class Locus:
         strand = None if strand == "." else strand
         frame = None if frame == "." else int(frame)
         # Get the attributes
-        attributes = dict(
-            [
-                (field.strip().split(attr_split))
-                for field in attributes.strip(";").split(";")
-            ]
-        )
+        # Split each field on the first delimiter only, values may
+        # contain the delimiter themselves. Empty fields are skipped.
+        fields = (field.strip() for field in attributes.strip().strip(";").split(";"))
+        attributes = dict(field.split(attr_split, 1) for field in fields if field)
         # Store the score in the attrs if it exists
         if score != ".":
             attributes["score"] = float(score)
@@ -0,0 +1,402 @@
+import numpy as np
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import Locus, _STRAND_SIGN
+from ..exceptions import StrandError
+
+__all__ = [
+    "chrom_codes",
+    "strand_signs",
+    "coordinates",
+    "from_columns",
+    "to_arrays",
+    "to_records",
+    "argsort",
+    "centers",
+    "stranded_starts",
+    "stranded_ends",
+    "distances",
+    "distance_matrix",
+    "center_distances",
+    "center_distance_matrix",
+    "overlaps",
+    "within",
+]
+
+# Chromosome names are mapped to integer codes so that arrays built
+# from different sets of loci can be compared with integer equality.
+# NOTE: codes are assigned in the order chromosomes are first seen,
+#       they are for equality only and do not sort like the names.
+_CHROM_CODES = {}
+
+
+# Genomic coordinates fit in 32 bits, which halves the memory
+# needed for the coordinate arrays compared to int64
+COORDINATE_DTYPE = np.int32
+
+
+def coordinates(values: Iterable[int], widen: bool = False) -> np.ndarray:
+    """
+    Returns the coordinates as an array of COORDINATE_DTYPE, raising
+    a ValueError if any of them do not fit.
+
+    Parameters
+    ----------
+    values : iterable of int
+    widen : bool (default: False)
+        If True, coordinates that do not fit are returned as an
+        int64 array instead of raising a ValueError.
+    """
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+    values = np.asarray(values, dtype=np.int64)
+    limits = np.iinfo(COORDINATE_DTYPE)
+    if len(values) > 0 and (values.min() < limits.min or values.max() > limits.max):
+        if widen:
+            return values
+        raise ValueError(f"Coordinates do not fit into {np.dtype(COORDINATE_DTYPE)}")
+    return values.astype(COORDINATE_DTYPE)
+
+
+def chrom_codes(chromosomes: Iterable[str]) -> np.ndarray:
+    """
+    Returns the integer codes for a sequence of chromosome names.
+    """
+    return np.array(
+        [_CHROM_CODES.setdefault(str(x), len(_CHROM_CODES)) for x in chromosomes],
+        dtype=np.int32,
+    )
+
+
+def strand_signs(strands: Iterable[str]) -> np.ndarray:
+    """
+    Returns the direction of each strand along the chromosome:
+    1 for '+', -1 for '-' and 0 for anything else.
+    """
+    return np.array([_STRAND_SIGN.get(x, 0) for x in strands], dtype=np.int8)
+
+
+def to_arrays(loci: Iterable[Locus]) -> Dict[str, np.ndarray]:
+    """
+    Converts loci into a dictionary of numpy arrays, one array
+    for each of the chromosome codes, starts, ends and strands.
+
+    Parameters
+    ----------
+    loci : iterable of Locus objects
+
+    Returns
+    -------
+    A dict with the keys 'chrom_code', 'start', 'end' and 'strand'
+    """
+    loci = list(loci)
+    return from_columns(
+        [x.chromosome for x in loci],
+        [x.start for x in loci],
+        [x.end for x in loci],
+        [x.strand for x in loci],
+    )
+
+
+def from_columns(
+    chromosomes: Iterable[str],
+    starts: Iterable[int],
+    ends: Iterable[int],
+    strands: Optional[Iterable[str]] = None,
+    widen: bool = False,
+) -> Dict[str, np.ndarray]:
+    """
+    Builds the same dictionary of arrays as to_arrays, but from
+    columns of chromosomes, starts, ends and strands instead of loci.
+
+    Parameters
+    ----------
+    chromosomes : iterable of str
+    starts : iterable of int
+    ends : iterable of int
+    strands : iterable of str (optional)
+        If not provided, the 'strand' key is left out.
+    widen : bool (default: False)
+        If True, coordinates that do not fit into COORDINATE_DTYPE
+        are stored as int64 instead of raising a ValueError.
+
+    Returns
+    -------
+    A dict with the keys 'chrom_code', 'start', 'end' and 'strand'
+    """
+    columns = {
+        "chrom_code": chrom_codes(chromosomes),
+        "start": coordinates(starts, widen=widen),
+        "end": coordinates(ends, widen=widen),
+    }
+    if strands is not None:
+        columns["strand"] = strand_signs(strands)
+    return columns
+
+
+# The fields of Locus.as_record as a numpy structured dtype
+RECORD_DTYPE = np.dtype(
+    [
+        ("chromosome", object),
+        ("start", COORDINATE_DTYPE),
+        ("end", COORDINATE_DTYPE),
+        ("source", object),
+        ("feature_type", object),
+        ("strand", object),
+        ("frame", object),
+        ("name", object),
+        ("hash", np.int64),
+    ]
+)
+
+
+def to_records(loci: Iterable[Locus]) -> Tuple[np.ndarray, List[dict]]:
+    """
+    The bulk version of Locus.as_record. Converts loci into a
+    numpy structured array with one record per locus.
+
+    Parameters
+    ----------
+    loci : iterable of Locus objects
+
+    Returns
+    -------
+    A tuple containing the structured array (see RECORD_DTYPE)
+    and a list with the attrs of each locus, in the same order.
+    """
+    loci = list(loci)
+    records = np.empty(len(loci), dtype=RECORD_DTYPE)
+    for field in RECORD_DTYPE.names:
+        if field == "hash":
+            records[field] = [x.stable_digest() for x in loci]
+        elif field in ("start", "end"):
+            records[field] = coordinates(getattr(x, field) for x in loci)
+        else:
+            records[field] = [getattr(x, field) for x in loci]
+    return records, [dict(x.attrs.items()) for x in loci]
+
+
+def argsort(a: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Returns the indices that sort the loci in the same order as
+    sorting Locus objects, i.e. by chromosome name then by start.
+    Ties keep their original order.
+
+    Parameters
+    ----------
+    a : dict of arrays (see to_arrays)
+
+    Returns
+    -------
+    A numpy array of indices
+    """
+    # Codes are assigned in the order chromosomes are first seen,
+    # so rank them by name before sorting on them
+    names = np.array(list(_CHROM_CODES), dtype=object)
+    ranks = np.empty(len(names), dtype=np.int64)
+    ranks[np.argsort(names, kind="stable")] = np.arange(len(names))
+    return np.lexsort((a["start"], ranks[a["chrom_code"]]))
+
+
+def centers(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    The vectorized version of Locus.center. Returns the center
+    base pair position of each locus.
+
+    NOTE: loci with an odd length have a 'half-bp' center.
+
+    Parameters
+    ----------
+    starts : numpy array of start positions
+    ends : numpy array of end positions
+
+    Returns
+    -------
+    A numpy array of center positions
+    """
+    return starts + (np.abs(ends - starts) + 1) / 2
+
+
+def stranded_starts(a: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    The vectorized version of Locus.stranded_start.
+
+    Parameters
+    ----------
+    a : dict of arrays (see to_arrays)
+
+    Raises
+    ------
+    StrandError if any of the loci have an invalid strand
+    """
+    if not a["strand"].all():
+        raise StrandError
+    return np.where(
+        a["strand"] > 0,
+        np.minimum(a["start"], a["end"]),
+        np.maximum(a["start"], a["end"]),
+    )
+
+
+def stranded_ends(a: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    The vectorized version of Locus.stranded_end.
+
+    Parameters
+    ----------
+    a : dict of arrays (see to_arrays)
+
+    Raises
+    ------
+    StrandError if any of the loci have an invalid strand
+    """
+    if not a["strand"].all():
+        raise StrandError
+    return np.where(
+        a["strand"] > 0,
+        np.maximum(a["start"], a["end"]),
+        np.minimum(a["start"], a["end"]),
+    )
+
+
+def distances(a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    The vectorized version of Locus.distance. Returns the number of
+    base pairs between each pair of loci in `a` and `b`, excluding
+    the start/end bases of the loci. Pairs on different chromosomes
+    have a distance of np.inf.
+
+    Parameters
+    ----------
+    a : dict of arrays (see to_arrays)
+    b : dict of arrays (see to_arrays)
+
+    Returns
+    -------
+    A numpy array of distances
+    """
+    return np.where(
+        a["chrom_code"] != b["chrom_code"],
+        np.inf,
+        np.where(
+            b["start"] < a["start"],
+            a["start"] - b["end"] - 1,
+            b["start"] - a["end"] - 1,
+        ),
+    )
+
+
+def distance_matrix(a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Returns the all-vs-all distances (see Locus.distance) between
+    the loci in `a` and the loci in `b`. The result has a row for
+    each locus in `a` and a column for each locus in `b`.
+
+    Parameters
+    ----------
+    a : dict of arrays (see to_arrays)
+    b : dict of arrays (see to_arrays)
+
+    Returns
+    -------
+    A 2D numpy array of distances
+    """
+    return distances(*_outer(a, b))
+
+
+def _outer(a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]) -> Tuple[dict, dict]:
+    # Reshape the arrays so that operations between them broadcast
+    # to every pair of loci
+    return (
+        {key: val[:, np.newaxis] for key, val in a.items()},
+        {key: val[np.newaxis, :] for key, val in b.items()},
+    )
+
+
+def center_distances(a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    The vectorized version of Locus.center_distance. Returns the
+    distance between the centers of each pair of loci in `a` and `b`.
+    Pairs on different chromosomes have a distance of np.inf.
+
+    Parameters
+    ----------
+    a : dict of arrays (see to_arrays)
+    b : dict of arrays (see to_arrays)
+
+    Returns
+    -------
+    A numpy array of distances
+    """
+    a_centers = centers(a["start"], a["end"])
+    b_centers = centers(b["start"], b["end"])
+    return np.where(
+        a["chrom_code"] == b["chrom_code"],
+        np.floor(np.abs(a_centers - b_centers)),
+        np.inf,
+    )
+
+
+def center_distance_matrix(
+    a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]
+) -> np.ndarray:
+    """
+    Returns the all-vs-all center distances (see Locus.center_distance)
+    between the loci in `a` and the loci in `b`. The result has a row
+    for each locus in `a` and a column for each locus in `b`.
+
+    Parameters
+    ----------
+    a : dict of arrays (see to_arrays)
+    b : dict of arrays (see to_arrays)
+
+    Returns
+    -------
+    A 2D numpy array of distances
+    """
+    return center_distances(*_outer(a, b))
+
+
+def overlaps(a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Returns a boolean array that is True for each pair of loci
+    in `a` and `b` that overlap by at least one base pair.
+
+    Parameters
+    ----------
+    a : dict of arrays (see to_arrays)
+    b : dict of arrays (see to_arrays)
+
+    Returns
+    -------
+    A boolean numpy array
+    """
+    return (
+        (a["chrom_code"] == b["chrom_code"])
+        & (a["start"] <= b["end"])
+        & (b["start"] <= a["end"])
+    )
+
+
+def within(a: Dict[str, np.ndarray], b: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Returns a boolean array that is True for each pair of loci
+    where the locus in `a` lies entirely within the locus in `b`
+    (inclusive). Use within(b, a) to test whether the loci in `a`
+    enclose the loci in `b`.
+
+    Parameters
+    ----------
+    a : dict of arrays (see to_arrays)
+    b : dict of arrays (see to_arrays)
+
+    Returns
+    -------
+    A boolean numpy array
+    """
+    return (
+        (a["chrom_code"] == b["chrom_code"])
+        & (b["start"] <= a["start"])
+        & (a["end"] <= b["end"])
+    )
@@ -1,5 +1,7 @@
 class LocusAttrs:
     # a restricted dict interface to attributes
+    __slots__ = ("_attrs",)
+
     def __init__(self, attrs=None):
         self._attrs = attrs
 
@@ -3,6 +3,8 @@ from typing import Generator
 
 class SubLoci:
     # A restricted list interface to subloci
+    __slots__ = ("_loci",)
+
     def __init__(self, loci=None):
         self._loci = loci
 
@@ -1,12 +1,13 @@
 #!/usr/bin/python3
 
+import json
+import random
 import logging
 
 import minus80 as m80
 
 from minus80 import Freezable
 from minus80.Tools import rawFile
-from scipy.stats import hypergeom
 from functools import lru_cache
 from collections import defaultdict
 from itertools import chain
@@ -15,6 +16,7 @@ from typing import Optional, Iterable, List, Union
 
 from .term import Term
 from locuspocus import Loci
+from locuspocus.loci import tune_db
 from locuspocus.exceptions import MissingLocusError
 
 __all__ = ["Ontology", "Term"]
@@ -40,6 +42,7 @@ class Ontology(Freezable):
 
     def __init__(self, name, rootdir: Optional[str] = None):
         super().__init__(name, rootdir=rootdir)
+        tune_db(self.m80.db)
         self._initialize_tables()
         self.metadata = self.m80.doc.table("metadata")
 
@@ -107,7 +110,7 @@ class Ontology(Freezable):
             (term.name, term.desc),
         )
 
-        (TID,) = cur.execute("SELECT last_insert_rowid()").fetchone()
+        TID = cur.getconnection().last_insert_rowid()
 
         if TID is None:  # pragma: no cover
             # I dont know when this would happen without another exception being thrown
@@ -245,24 +248,27 @@ class Ontology(Freezable):
                 LIDs.append(self.loci._get_LID(l))
             except MissingLocusError:
                 continue
-        # query the database
+        # query the database, the LIDs are bound as a single json
+        # array so the statement text (and its cached prepared
+        # statement) is the same for every call
         TIDs = (
             self.m80.db.cursor()
-            .execute("""
-                SELECT DISTINCT TID 
-                FROM term_loci WHERE LID IN ('{}')
-            """.format("','".join(map(str, LIDs)))
-            ).fetchall()
-        )
-
-        terms = [self[TID] for (TID,) in TIDs]
-        # Fetch the terms with the proper size
-        terms = list(
-            filter(
-                lambda t: (len(t) >= min_term_size) and (len(t) <= max_term_size), terms
+            .execute(
+                """
+                SELECT TID FROM term_loci
+                WHERE TID IN (
+                    SELECT TID FROM term_loci
+                    WHERE LID IN (SELECT value FROM json_each(?))
+                )
+                GROUP BY TID
+                HAVING COUNT(LID) >= ?
+                    AND COUNT(LID) <= ?
+                """,
+                (json.dumps(LIDs), min_term_size, max_term_size),
             )
+            .fetchall()
         )
-        return terms
+        return [self[TID] for (TID,) in TIDs]
 
     def terms(self, min_term_size=0, max_term_size=10e10) -> Iterable[Term]:
         """
@@ -303,17 +309,18 @@ class Ontology(Freezable):
             otherwise return a list of terms.
         """
         cur = self.m80.db.cursor()
+        # Sampling in python avoids sorting every matching term by
+        # a random key just to keep the first n
         TIDs = cur.execute(
             """ 
             SELECT DISTINCT(TID) FROM term_loci 
             GROUP BY TID
             HAVING COUNT(LID) >= ?
-                AND COUNT(LID) <= ?
-            ORDER BY RANDOM() 
-            LIMIT ?;
+                AND COUNT(LID) <= ?;
         """,
-            (min_term_size, max_term_size, n),
+            (min_term_size, max_term_size),
         ).fetchall()
+        TIDs = random.sample(TIDs, min(n, len(TIDs)))
         if len(TIDs) == 0:
             raise ValueError(
                 "No Terms exists with this criteria "
@@ -431,6 +438,8 @@ class Ontology(Freezable):
             return enriched_terms
         if not isinstance(target, Term):
             raise ValueError("Expected target to be either Ontology or Term")
+        # scipy is slow to import and only needed here
+        from scipy.stats import hypergeom
 
         # Calculate the size of the Universe
         if num_universe is None:
@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from operator import attrgetter
+
 
 class Term:
     """
@@ -29,9 +31,7 @@ class Term:
         self.name = name
         self.desc = desc
         # Manage the loci
-        self.loci = set()
-        if loci is not None:
-            [self.add_locus(l) for l in loci]
+        self.loci = set(loci) if loci is not None else set()
         # Manage the attrs 
         self.attrs = dict() 
         if attrs is not None:
@@ -120,9 +120,11 @@ class Term:
             The maximum distance two loci need to be to
             not be collapsed into an effective locus
         """
-        loci = sorted(self.loci)
-        collapsed = [loci.pop(0)]
-        for locus in loci:
+        # Sorting on a key tuple orders loci the same way as Locus.__lt__
+        # without a python level comparison for every pair
+        loci = sorted(self.loci, key=attrgetter("chromosome", "start"))
+        collapsed = loci[:1]
+        for locus in loci[1:]:
             tail = collapsed[-1]
             # if they have overlapping windows, collapse
             if tail.distance(locus) <= max_distance:
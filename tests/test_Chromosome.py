@@ -60,3 +60,9 @@ def test_bad_nucleotide_in_chromosome_seq():
     with pytest.raises(KeyError):
         Chromosome("test", "abcd")
     assert True
+
+
+def test_empty_chromosome():
+    x = Chromosome("chr1", "")
+    assert x[1:100] == ""
+    assert repr(x) == "Chromosome('')"
@@ -1,7 +1,9 @@
 import os
 import pytest
+import numpy as np
 
 from locuspocus import Locus, Loci
+from locuspocus.locus import arrays
 from locuspocus.exceptions import MissingLocusError, StrandError
 
 import minus80 as m80
@@ -74,6 +76,30 @@ def test_add_locus_with_attrs():
     m80.delete("Loci", "empty")
 
 
+def test_add_loci():
+    "add many loci to an empty refloci db in one transaction"
+    if m80.exists("Loci", "empty"):
+        m80.delete("Loci", "empty")
+    empty = Loci("empty")
+    x = Locus("1", 1, 1, feature_type="gene", attrs={"foo": "bar"})
+    y = Locus("1", 2, 2, feature_type="gene", attrs={"baz": "bat"})
+    LIDs = empty.add_loci([x, y])
+    assert len(empty) == 2
+    assert empty._get_locus_by_LID(LIDs[1])["baz"] == "bat"
+    m80.delete("Loci", "empty")
+
+
+def test_add_loci_restores_synchronous():
+    if m80.exists("Loci", "empty"):
+        m80.delete("Loci", "empty")
+    empty = Loci("empty")
+    cur = empty.m80.db.cursor()
+    cur.execute("PRAGMA synchronous = FULL").fetchall()
+    empty.add_loci([Locus("1", 1, 1), Locus("1", 2, 2)])
+    assert cur.execute("PRAGMA synchronous").fetchone()[0] == 2
+    m80.delete("Loci", "empty")
+
+
 def test_nuke_tables():
     "add a locus to an empty refloci db and then retrieve it"
     if m80.exists("Loci", "empty"):
@@ -141,6 +167,12 @@ def test_iter(testRefGen):
     assert i == NUM_GENES
 
 
+def test_iter_prefetches_rows(testRefGen):
+    locus = next(iter(testRefGen))
+    assert locus._cached_row is not None
+    assert locus == testRefGen[locus.name]
+
+
 def test_rand(testRefGen):
     "test instance type"
     assert isinstance(testRefGen.rand(), Locus)
@@ -166,6 +198,10 @@ def test_rand_no_autopop(testRefGen):
     assert len(testRefGen.rand(1, autopop=False)) == 1
 
 
+def test_rand_not_distinct(testRefGen):
+    assert len(testRefGen.rand(100, distinct=False)) == 100
+
+
 # The first 4 genes on chromosome 9
 # 1       ensembl gene    4854    9652    .       -       .       ID=GRMZM2G059865;Name=GRMZM2G059865;biotype=protein_coding
 # 1       ensembl gene    9882    10387   .       -       .       ID=GRMZM5G888250;Name=GRMZM5G888250;biotype=protein_coding
@@ -350,6 +386,109 @@ def test_encompassing_loci(testRefGen):
     assert loci[0].name == "GRMZM5G888250"
 
 
+def test_overlapping_loci(testRefGen):
+    "put the locus boundaries within gene [1] and [4], partial overlaps are included"
+    loci = list(testRefGen.overlapping_loci(Locus("1", 6000, 137000)))
+    assert len(loci) == 4
+    assert loci[0].start == 4854
+
+
+def test_overlapping_loci_single_bp(testRefGen):
+    x = Locus("1", 10000, 10000)
+    loci = list(testRefGen.overlapping_loci(x))
+    assert len(loci) == 1
+    assert loci[0].name == "GRMZM5G888250"
+
+
+def test_overlapping_loci_missing_chromosome(testRefGen):
+    assert len(list(testRefGen.overlapping_loci(Locus("0", 1, 100)))) == 0
+
+
+def test_contained_loci(testRefGen):
+    "put the locus boundaries within gene [1] and [4], only [2] and [3] are contained"
+    loci = list(testRefGen.contained_loci(Locus("1", 6000, 137000)))
+    assert [x.start for x in loci] == [9882, 109519]
+
+
+def test_contained_loci_shared_boundaries(testRefGen):
+    loci = list(testRefGen.contained_loci(Locus("1", 9882, 111769)))
+    assert [x.start for x in loci] == [9882, 109519]
+
+
+def test_overlap_join(testRefGen):
+    queries = [
+        Locus("1", 6000, 137000),
+        Locus("0", 1, 100),
+        Locus("1", 10000, 10000),
+    ]
+    results = testRefGen.overlap_join(queries)
+    assert len(results) == 3
+    for query, result in zip(queries, results):
+        expected = list(testRefGen.overlapping_loci(query))
+        assert [x.name for x in result] == [x.name for x in expected]
+
+
+def test_count_overlapping(testRefGen):
+    queries = [
+        Locus("1", 6000, 137000),
+        Locus("0", 1, 100),
+        Locus("1", 10000, 10000),
+    ]
+    counts = testRefGen.count_overlapping(queries)
+    assert list(counts) == [4, 0, 1]
+
+
+def test_coverage(testRefGen):
+    positions, coverage = testRefGen.coverage("1")
+    assert list(positions[:4]) == [4854, 9653, 9882, 10388]
+    assert list(coverage[:4]) == [1, 0, 1, 0]
+    assert coverage[-1] == 0
+
+
+def test_coverage_missing_chromosome(testRefGen):
+    positions, coverage = testRefGen.coverage("0")
+    assert len(positions) == 0
+
+
+def test_coordinate_arrays(testRefGen):
+    coords = testRefGen.coordinate_arrays()
+    assert len(coords["LID"]) == NUM_GENES
+    assert coords["start"].dtype == np.int32
+    query = Locus("1", 6000, 137000)
+    mask = arrays.overlaps(coords, arrays.to_arrays([query]))
+    assert mask.sum() == len(list(testRefGen.overlapping_loci(query)))
+
+
+def test_to_arrays(testRefGen):
+    arrays = testRefGen.to_arrays()
+    assert len(arrays["start"]) == NUM_GENES
+    assert arrays["start"].dtype == np.int64
+    assert all(arrays["start"] <= arrays["end"])
+
+
+def test_to_arrays_columns(testRefGen):
+    arrays = testRefGen.to_arrays(["chromosome", "start"])
+    assert set(arrays.keys()) == {"chromosome", "start"}
+
+
+def test_to_arrays_bad_column(testRefGen):
+    with pytest.raises(ValueError):
+        testRefGen.to_arrays(["foobar"])
+
+
+def test_coordinates_larger_than_int32():
+    if m80.exists("Loci", "bigCoords"):
+        m80.delete("Loci", "bigCoords")
+    x = Loci("bigCoords")
+    x.add_locus(Locus("1", 1, 100, name="a"))
+    x.add_locus(Locus("1", 2_500_000_000, 2_500_000_100, name="b"))
+    assert x.coordinate_arrays()["start"].dtype == np.int64
+    big = Locus("1", 2_499_999_000, 2_500_001_000)
+    assert [l.name for l in x.within(big, partial=True)] == ["b"]
+    assert [l.name for l in x.upstream_loci(x["b"], n=1)] == ["a"]
+    m80.delete("Loci", "bigCoords")
+
+
 def test_full_import_gff():
     if m80.exists("Loci", "ZmSmall"):
         m80.delete("Loci", "ZmSmall")
@@ -366,3 +505,48 @@ def test_import_gff_gzipped():
     x = Loci("ZmSmall")
     x.import_gff(gff)
     m80.delete("Loci", "ZmSmall")
+
+
+def test_encompassing_loci_matches_overlapping_loci(testRefGen):
+    x = Locus("1", 6000, 6500)
+    expected = [
+        l.name
+        for l in testRefGen.overlapping_loci(x)
+        if l.start < x.start and l.end > x.end
+    ]
+    assert [l.name for l in testRefGen.encompassing_loci(x)] == expected
+
+
+def test_range_queries_prefetch_rows(testRefGen):
+    x = Locus("1", 6000, 137000)
+    for locus in testRefGen.overlapping_loci(x):
+        assert locus._cached_row is not None
+        assert locus == testRefGen[locus.name]
+    for locus in testRefGen.within(x):
+        assert locus._cached_row is not None
+        assert locus == testRefGen[locus.name]
+
+
+def test_getitem_not_cached_after_nuke():
+    if m80.exists("Loci", "cacheTest"):
+        m80.delete("Loci", "cacheTest")
+    x = Loci("cacheTest")
+    x.add_locus(Locus("1", 1, 100, name="a"))
+    assert x["a"] is x["a"]
+    x._nuke_tables()
+    assert "a" not in x
+    m80.delete("Loci", "cacheTest")
+
+
+def test_view_not_found_after_nuke():
+    if m80.exists("Loci", "cacheTest"):
+        m80.delete("Loci", "cacheTest")
+    x = Loci("cacheTest")
+    x.add_locus(Locus("1", 1, 100, name="a"))
+    view = x["a"]
+    assert view in x
+    x._nuke_tables()
+    assert view not in x
+    with pytest.raises(MissingLocusError):
+        x[view]
+    m80.delete("Loci", "cacheTest")
@@ -3,6 +3,7 @@ import numpy as np
 
 from itertools import chain
 from locuspocus import Locus
+from locuspocus.locus import arrays
 
 from locuspocus.exceptions import StrandError, ChromosomeError
 
@@ -28,6 +29,10 @@ def test_default_getitem(simple_Locus):
     assert simple_Locus.default_getitem("name", "default") == "default"
 
 
+def test_default_getitem_present(simple_Locus):
+    assert simple_Locus.default_getitem("foo", "default") == "bar"
+
+
 def test_start(simple_Locus):
     assert simple_Locus.start == 100
 
@@ -58,7 +63,18 @@ def test_minus_stranded_end():
 
 def test_hash():
     l = Locus("1", 1, 100, strand="+")
-    assert hash(l) == 530409172339088127
+    assert hash(l) == hash(Locus("1", 1, 100, strand="+"))
+
+
+def test_stable_digest():
+    l = Locus("1", 1, 100, strand="+")
+    assert l.stable_digest() == 530409172339088127
+
+
+def test_stable_digest_with_subloci():
+    x = Locus("1", 1, 100, subloci=[Locus("1", 1, 10)])
+    y = Locus("1", 1, 100, subloci=[Locus("1", 1, 11)])
+    assert x.stable_digest() != y.stable_digest()
 
 
 def test_coor(simple_Locus):
@@ -83,6 +99,18 @@ def test_downstream_minus_strand(simple_Locus):
     assert l.downstream(50) == 50
 
 
+def test_upstream_invalid_strand():
+    l = Locus("1", 1, 100, strand="=")
+    with pytest.raises(StrandError):
+        l.upstream(50)
+
+
+def test_downstream_invalid_strand():
+    l = Locus("1", 1, 100, strand=None)
+    with pytest.raises(StrandError):
+        l.downstream(50)
+
+
 def test_center():
     l = Locus("1", 100, 200, strand="-")
     assert l.center == 150.5
@@ -366,6 +394,31 @@ def test_stranded_stop_invalid():
         x.stranded_end
 
 
+def test_hash_changes_with_coordinates():
+    x = Locus("1", 3, 4, strand="+")
+    h = hash(x)
+    x.end = 5
+    assert hash(x) != h
+    x.end = 4
+    assert hash(x) == h
+
+
+def test_eq_compares_subloci():
+    x = Locus("1", 3, 4, subloci=[Locus("1", 3, 3)])
+    y = Locus("1", 3, 4, subloci=[Locus("1", 3, 3, attrs={"foo": "bar"})])
+    z = Locus("1", 3, 4, subloci=[Locus("1", 4, 4)])
+    assert x == y
+    assert x != z
+    assert hash(x) == hash(z)
+
+
+def test_stable_digest_ignores_attrs():
+    x = Locus("1", 3, 4, strand="+")
+    digest = x.stable_digest()
+    x["foo"] = "bar"
+    assert x.stable_digest() == digest
+
+
 def test_as_record():
     x = Locus("1", 3, 4, strand="+")
     # This doesn't compare the dictionaries of each ...
@@ -382,6 +435,32 @@ def test_as_record():
     )
 
 
+def test_as_dict(simple_Locus):
+    x = simple_Locus
+    x.add_sublocus(Locus("1", 100, 150, name="sub1", attrs={"a": 1}))
+    assert x.as_dict() == {
+        "chromosome": "1",
+        "start": 100,
+        "end": 200,
+        "source": "locuspocus",
+        "feature_type": "locus",
+        "strand": "+",
+        "frame": None,
+        "name": None,
+        "attrs": {"foo": "bar"},
+        "subloci": ["sub1"],
+    }
+
+
+def test_as_dict_deep(simple_Locus):
+    x = simple_Locus
+    x.add_sublocus(Locus("1", 100, 150, name="sub1", attrs={"a": 1}))
+    (sub,) = x.as_dict(deep=True)["subloci"]
+    assert sub["name"] == "sub1"
+    assert sub["attrs"] == {"a": 1}
+    assert sub["subloci"] == []
+
+
 def test_center_distance():
     x = Locus("1", 1, 100, strand="+")
     # This needs to be 201 since x starts at 1
@@ -412,6 +491,13 @@ def test_combine():
     assert y in z.subloci
 
 
+def test_combine_reversed():
+    x = Locus("1", 1, 2)
+    y = Locus("1", 3, 4)
+    z = y.combine(x)
+    assert z.coor == (1, 4)
+
+
 def test_combine_chromosome_mismatch():
     x = Locus("1", 1, 2)
     y = Locus("2", 3, 4)
@@ -429,3 +515,126 @@ def test_distance_diff_chroms():
     x = Locus("1", 1, 100)
     y = Locus("2", 150, 250)
     assert x.distance(y) == np.inf
+
+
+def test_arrays_center_distances():
+    a = [Locus("1", 1, 100), Locus("1", 1, 100), Locus("1", 10, 20)]
+    b = [Locus("1", 201, 300), Locus("2", 201, 300), Locus("1", 11, 18)]
+    distances = arrays.center_distances(arrays.to_arrays(a), arrays.to_arrays(b))
+    assert list(distances) == [x.center_distance(y) for x, y in zip(a, b)]
+
+
+def test_arrays_overlaps():
+    a = [Locus("1", 1, 100), Locus("1", 1, 100), Locus("1", 1, 100)]
+    b = [Locus("1", 100, 200), Locus("1", 101, 200), Locus("2", 1, 100)]
+    overlaps = arrays.overlaps(arrays.to_arrays(a), arrays.to_arrays(b))
+    assert list(overlaps) == [True, False, False]
+
+
+def test_arrays_centers():
+    loci = [Locus("1", 100, 200), Locus("1", 100, 199)]
+    x = arrays.to_arrays(loci)
+    assert list(arrays.centers(x["start"], x["end"])) == [l.center for l in loci]
+
+
+def test_overlaps():
+    x = Locus("1", 1, 100)
+    assert x.overlaps(Locus("1", 100, 200))
+    assert x.overlaps(Locus("1", 10, 20))
+    assert not x.overlaps(Locus("1", 101, 200))
+    assert not x.overlaps(Locus("2", 1, 100))
+
+
+def test_arrays_overlaps_matches_overlaps():
+    a = [Locus("1", 1, 100), Locus("1", 50, 60), Locus("2", 1, 100)]
+    b = [Locus("1", 100, 200), Locus("1", 61, 70), Locus("1", 1, 100)]
+    overlaps = arrays.overlaps(arrays.to_arrays(a), arrays.to_arrays(b))
+    assert list(overlaps) == [x.overlaps(y) for x, y in zip(a, b)]
+
+
+def test_arrays_within():
+    a = [Locus("1", 10, 20), Locus("1", 1, 100), Locus("1", 10, 20)]
+    b = [Locus("1", 10, 20), Locus("1", 10, 20), Locus("2", 1, 100)]
+    a, b = arrays.to_arrays(a), arrays.to_arrays(b)
+    assert list(arrays.within(a, b)) == [True, False, False]
+    assert list(arrays.within(b, a)) == [True, True, False]
+
+
+def test_arrays_to_records():
+    loci = [Locus("1", 3, 4, strand="+"), Locus("2", 10, 20, attrs={"foo": "bar"})]
+    records, attrs = arrays.to_records(loci)
+    assert tuple(records[0]) == loci[0].as_record()[0]
+    assert records["start"].dtype == np.int32
+    assert attrs == [{}, {"foo": "bar"}]
+
+
+def test_arrays_distances():
+    a = [Locus("1", 1, 10), Locus("1", 20, 30), Locus("1", 1, 10), Locus("1", 5, 8)]
+    b = [Locus("1", 20, 30), Locus("1", 1, 10), Locus("2", 20, 30), Locus("1", 5, 9)]
+    distances = arrays.distances(arrays.to_arrays(a), arrays.to_arrays(b))
+    assert list(distances) == [x.distance(y) for x, y in zip(a, b)]
+
+
+def test_eq_other_types():
+    x = Locus("1", 1, 100)
+    assert x != "1:1-100"
+    assert not x == None
+
+
+def test_arrays_distance_matrix():
+    a = [Locus("1", 1, 10), Locus("2", 20, 30)]
+    b = [Locus("1", 20, 30), Locus("1", 5, 8), Locus("2", 1, 10)]
+    matrix = arrays.distance_matrix(arrays.to_arrays(a), arrays.to_arrays(b))
+    assert matrix.shape == (2, 3)
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            assert matrix[i, j] == x.distance(y)
+
+
+def test_arrays_coordinate_overflow():
+    with pytest.raises(ValueError):
+        arrays.to_arrays([Locus("1", 1, 2**31)])
+
+
+def test_arrays_center_distance_matrix():
+    a = [Locus("1", 1, 100), Locus("2", 20, 30)]
+    b = [Locus("1", 201, 300), Locus("1", 5, 8), Locus("2", 1, 10)]
+    matrix = arrays.center_distance_matrix(arrays.to_arrays(a), arrays.to_arrays(b))
+    assert matrix.shape == (2, 3)
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            assert matrix[i, j] == x.center_distance(y)
+
+
+def test_arrays_stranded_starts_and_ends():
+    loci = [Locus("1", 10, 20, strand="+"), Locus("1", 10, 20, strand="-")]
+    x = arrays.to_arrays(loci)
+    assert list(x["strand"]) == [1, -1]
+    assert list(arrays.stranded_starts(x)) == [l.stranded_start for l in loci]
+    assert list(arrays.stranded_ends(x)) == [l.stranded_end for l in loci]
+
+
+def test_arrays_stranded_starts_invalid():
+    x = arrays.to_arrays([Locus("1", 10, 20, strand="=")])
+    with pytest.raises(StrandError):
+        arrays.stranded_starts(x)
+
+
+def test_arrays_argsort():
+    loci = [
+        Locus("2", 5, 10),
+        Locus("10", 50, 60),
+        Locus("1", 30, 40),
+        Locus("2", 1, 4),
+        Locus("1", 30, 35),
+    ]
+    order = arrays.argsort(arrays.to_arrays(loci))
+    assert [loci[i] for i in order] == sorted(loci)
+
+
+def test_from_gff_line_attrs():
+    line = "1\tensembl\tgene\t4854\t9652\t.\t-\t.\tID=gene1;Note=a=b;;Name=x;\n"
+    x = Locus.from_gff_line(line)
+    assert x.name == "gene1"
+    assert x["Note"] == "a=b"
+    assert x["Name"] == "x"
@@ -37,6 +37,12 @@ def test_initialization(simpleLocusView):
     assert len(simpleLocusView) == 101
 
 
+def test_core_properties_share_one_row(SimpleLoci):
+    x = SimpleLoci["x"]
+    assert (x.chromosome, x.start, x.end, x.name) == ("1", 100, 200, "x")
+    assert x.coor == (100, 200)
+
+
 def test_getitem(simpleLocusView):
     assert simpleLocusView["foo"] == "bar"
 
@@ -326,3 +332,97 @@ def test_distance_diff_chroms():
 def test_get_subloci_by_index(SimpleLoci):
     x = SimpleLoci["x"]
     assert x.subloci[0]
+
+
+def test_get_subloci_by_negative_index(SimpleLoci):
+    x = SimpleLoci["x"]
+    assert x.subloci[-1].start == 20
+
+
+def test_get_subloci_index_error(SimpleLoci):
+    x = SimpleLoci["x"]
+    with pytest.raises(IndexError):
+        x.subloci[2]
+
+
+def test_subloci_traverse():
+    gene = Locus("1", 100, 200, name="gene")
+    mRNA = Locus("1", 100, 200, name="mRNA")
+    mRNA.add_sublocus(Locus("1", 100, 120, name="exon1"))
+    mRNA.add_sublocus(Locus("1", 180, 200, name="exon2"))
+    gene.add_sublocus(mRNA)
+    gene.add_sublocus(Locus("1", 150, 160, name="other"))
+    if m80.exists("Loci", "test_traverse"):
+        m80.delete("Loci", "test_traverse")
+    ref = Loci("test_traverse")
+    ref.add_locus(gene)
+    x = ref["gene"]
+    expected = ["mRNA", "exon1", "exon2", "other"]
+    assert [l.name for l in x.subloci.traverse()] == expected
+    assert [l.name for l in x.subloci[0].subloci.traverse()] == ["exon1", "exon2"]
+    assert x.subloci.find("exon2").start == 180
+    m80.delete("Loci", "test_traverse")
+
+
+def test_eq_same_view(SimpleLoci):
+    assert SimpleLoci["x"] == SimpleLoci["x"]
+    assert SimpleLoci["x"] != SimpleLoci["y"]
+
+
+def test_attrs_view_setitem(SimpleLoci):
+    x = SimpleLoci["x"]
+    assert "baz" not in x.attrs
+    x["baz"] = "qux"
+    assert x["baz"] == "qux"
+    assert SimpleLoci["x"]["baz"] == "qux"
+    assert len(x.attrs) == 2
+
+
+def test_attrs_view_missing_key(SimpleLoci):
+    x = SimpleLoci["y"]
+    with pytest.raises(KeyError):
+        x["missing"]
+
+
+def test_get_LID_of_own_view(SimpleLoci):
+    x = SimpleLoci["x"]
+    assert SimpleLoci._get_LID(x) == x._LID
+    assert x in SimpleLoci
+
+
+def test_attrs_view_write_seen_by_other_views(SimpleLoci):
+    x = SimpleLoci["x"]
+    other = next(l for l in SimpleLoci if l.name == "x")
+    assert other is not x
+    other["baz"]
+    x["baz"] = "changed"
+    assert other["baz"] == "changed"
+    assert other.attrs.items() == x.attrs.items()
+
+
+def test_stable_digest(SimpleLoci):
+    x = SimpleLoci["x"]
+    original = Locus(
+        "1",
+        100,
+        200,
+        name="x",
+        subloci=[Locus("1", 10, 20), Locus("1", 20, 30)],
+    )
+    assert x.stable_digest() == original.stable_digest()
+    assert hash(x) == hash(original)
+    assert SimpleLoci._get_LID(original) == x._LID
+
+
+def test_hash_matches_locus_without_subloci(SimpleLoci):
+    x = SimpleLoci["x"]
+    assert hash(x) == hash(Locus("1", 100, 200, name="x"))
+
+
+def test_attrs_cached_by_loci(SimpleLoci):
+    x = SimpleLoci["x"]
+    assert x["foo"] == "bar"
+    assert ("loci_attrs", x._LID) in SimpleLoci._cached_attrs
+    x["foo"] = "baz"
+    assert ("loci_attrs", x._LID) not in SimpleLoci._cached_attrs
+    assert x["foo"] == "baz"
@@ -75,3 +75,15 @@ def test_nearby_loci(t):
     assert len(nearby) == 1
     nearby = list(t.nearby_loci(x, max_distance=10))
     assert len(nearby) == 0
+
+
+def test_effective_loci():
+    t = Term(
+        "test",
+        loci=[Locus("1", 1000, 1100), Locus("1", 150, 200), Locus("1", 1, 100)],
+    )
+    effective = t.effective_loci(max_distance=100)
+    assert len(effective) == 2
+    assert effective[0].coor == (1, 200)
+    assert len(effective[0].subloci) == 2
+    assert effective[1].coor == (1000, 1100)